@@ -1,8 +1,8 @@
 define racer_build
 	$(eval goal := $(patsubst build-%,%,$1))
 	$(eval args := $(subst -, ,$(goal)))
-	$(eval opts := $(if $(findstring $1,$(MAKECMDGOALS)),$(EXTRA),))
-	$(eval vals := $(if $(findstring $1,$(MAKECMDGOALS)),$(VALUE),))
+	$(eval opts := $(if $(findstring $1,$(MAKECMDGOALS) $(EXTRA_GOALS)),$(EXTRA),))
+	$(eval vals := $(if $(findstring $1,$(MAKECMDGOALS) $(EXTRA_GOALS)),$(VALUE),))
 	python3 script/build.py $(opts) $(args) $(vals)
 endef
 
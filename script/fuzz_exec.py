@@ -441,7 +441,7 @@ class FuzzUnit(object):
         # create the sub-directory
         path = mkdir_seq(padir)
         with open(os.path.join(path, 'program'), 'wb') as f:
-            pickle.dump(program, f)
+            pickle.dump(program, f, protocol=pickle.HIGHEST_PROTOCOL)
 
         return path
 
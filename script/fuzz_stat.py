@@ -1,21 +1,33 @@
 #!/usr/bin/env python3
 
-from typing import cast, NamedTuple, Iterator, Dict, Set, List, Tuple, Optional
+from typing import cast, NamedTuple, Iterator, Dict, Set, List, Tuple, \
+    Pattern
 
 import re
 import os
 import sys
+import mmap
 import time
 import pickle
 
 from dataclasses import dataclass
+from operator import attrgetter
+from functools import lru_cache
+from collections import Counter
 from argparse import ArgumentParser
 
 from spec_basis import Syscall, Program
 from fuzz_engine import Seed
+from util import is_error_code, parallelize_iter
 
 import config
 
+# constants
+RE_STRACE_RECORD = re.compile(
+    rb'^\[strace: *(\d+)\] (->|<-) (\w+)\(.*?\) = (-?\d+|<fd: -?\d+>)$',
+    re.DOTALL | re.MULTILINE
+)
+
 
 class SeedExecPack(NamedTuple):
     seed: Seed
@@ -36,20 +48,17 @@ class StraceRecord(object):
     name: str
     retv: int
     line: str
-
-    def is_error(self) -> bool:
-        return -4096 < self.retv < 0
+    is_error: bool = False
 
 
 class StraceLedger(object):
 
-    def __init__(self) -> None:
-        self.ledger = {}  # type: Dict[int, List[StraceRecord]]
+    def __init__(self, nthreads: int) -> None:
+        self.ledger = [
+            [] for _ in range(nthreads)
+        ]  # type: List[List[StraceRecord]]
 
     def add_record(self, record: StraceRecord) -> None:
-        if record.tseq not in self.ledger:
-            self.ledger[record.tseq] = []
-
         self.ledger[record.tseq].append(record)
 
     @classmethod
@@ -57,13 +66,16 @@ class StraceLedger(object):
         if len(trace) != len(given):
             return False
 
-        for record, syscall in zip(trace, given):
-            if record.name != syscall.name.split('$')[0]:
-                return False
-
-        return True
+        return all(
+            record.name == syscall.base_name()
+            for record, syscall in zip(trace, given)
+        )
 
     def validate(self, program: Program) -> bool:
+        # an empty strace means the execution produced nothing at all
+        if len(self.ledger) == 0:
+            return False
+
         if not StraceLedger._check(self.ledger[0], program.thread_main):
             return False
 
@@ -97,59 +109,39 @@ class StraceLedger(object):
 
 # parsers
 def parse_strace(base: str) -> StraceLedger:
-    re_head = re.compile(r'^\[strace: *(\d+?)\] (->|<-) (\w+?)\(')
-    re_tail = re.compile(r'\) = (-?\d+|<fd: -?\d+>)$')
-
     records = []  # type: List[StraceRecord]
     tseqset = set()  # type: Set[int]
 
-    with open(os.path.join(base, 'strace'), 'r') as f:
-        r = None  # type: Optional[StraceRecord]
-        for l in f:
-            counted = False
-
-            # check if head is present
-            if r is None:
-                m = re_head.search(l)
-                assert m is not None
-                r = StraceRecord(
-                    tseq=int(m.group(1)) if m.group(2) == '<-' else 0,
-                    name=m.group(3),
-                    retv=0,
-                    line=l,
-                )
-                counted = True
-
-            # check if tail is present
-            if r is not None:
-                m = re_tail.search(l)
-                if m is None:
-                    r.line += l
-                    continue
-
-                retv = m.group(1)
-                if 'fd' in retv:
-                    r.retv = int(retv[5:-1])
-                else:
-                    r.retv = int(retv)
-
-                if not counted:
-                    r.line += l
+    with open(os.path.join(base, 'strace'), 'rb') as f:
+        # mmap refuses to map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return StraceLedger(0)
 
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for m in RE_STRACE_RECORD.finditer(mm):
                 # only record those with return value
-                if r.tseq != 0:
-                    records.append(r)
-                    tseqset.add(r.tseq)
+                if m.group(2) != b'<-':
+                    continue
 
-                r = None
+                text = m.group(4)
+                retv = int(text[5:-1] if text[0] == ord('<') else text)
+                r = StraceRecord(
+                    tseq=int(m.group(1)),
+                    name=m.group(3).decode('ascii'),
+                    retv=retv,
+                    line=m.group(0).decode(),
+                    is_error=is_error_code(retv),
+                )
+                records.append(r)
+                tseqset.add(r.tseq)
 
     # sort the records by thread id
-    tseqord = sorted(tseqset)
+    tseqord = {t: i for i, t in enumerate(sorted(tseqset))}
     for r in records:
-        r.tseq = tseqord.index(r.tseq)
+        r.tseq = tseqord[r.tseq]
 
     # build the ledger
-    ledger = StraceLedger()
+    ledger = StraceLedger(len(tseqord))
 
     for r in records:
         ledger.add_record(r)
@@ -157,6 +149,13 @@ def parse_strace(base: str) -> StraceLedger:
     return ledger
 
 
+# loaders
+@lru_cache(maxsize=256)
+def load_program(base: str) -> Program:
+    with open(os.path.join(base, 'program'), 'rb') as f:
+        return cast(Program, pickle.load(f))
+
+
 # iterator
 def iter_seed_exec() -> Iterator[SeedExecPack]:
     stamp = time.time()
@@ -187,27 +186,26 @@ def iter_seed_exec() -> Iterator[SeedExecPack]:
 
 
 def iter_seed_exec_inc() -> Iterator[SeedExecPack]:
-    packs = [i for i in iter_seed_exec()]
-    for i in sorted(packs, key=lambda x: x.ctime):
-        yield i
+    yield from sorted(iter_seed_exec(), key=attrgetter('ctime'))
 
 
 def iter_seed_exec_dec() -> Iterator[SeedExecPack]:
-    packs = [i for i in iter_seed_exec()]
-    for i in sorted(packs, key=lambda x: x.ctime, reverse=True):
-        yield i
+    yield from sorted(iter_seed_exec(), key=attrgetter('ctime'), reverse=True)
 
 
 def iter_syscall_strace() -> Iterator[Tuple[str, Syscall, StraceRecord]]:
-    progs = {}  # type: Dict[str, Program]
-    for pack in iter_seed_exec_inc():
-        base = os.path.dirname(pack.path)
-        if base not in progs:
-            with open(os.path.join(base, 'program'), 'rb') as f:
-                progs[base] = pickle.load(f)
+    # the packs are sorted (hence collected) anyway, but stream the ledgers
+    packs = list(iter_seed_exec_inc())
+
+    # parsing is independent per execution, fan it out
+    ledgers = parallelize_iter(parse_strace, [pack.path for pack in packs])
 
-        prog = progs[base]
-        ledger = parse_strace(pack.path)
+    for pack, ledger in zip(packs, ledgers):
+        # the execution produced no strace at all, nothing to link
+        if len(ledger.ledger) == 0:
+            continue
+
+        prog = load_program(os.path.dirname(pack.path))
         assert ledger.validate(prog)
 
         strace = ledger.link(prog)
@@ -239,15 +237,11 @@ def iter_primitive() -> Iterator[PrimitivePack]:
 
 
 def iter_primitive_inc() -> Iterator[PrimitivePack]:
-    packs = [i for i in iter_primitive()]
-    for i in sorted(packs, key=lambda x: x.ctime):
-        yield i
+    yield from sorted(iter_primitive(), key=attrgetter('ctime'))
 
 
 def iter_primitive_dec() -> Iterator[PrimitivePack]:
-    packs = [i for i in iter_primitive()]
-    for i in sorted(packs, key=lambda x: x.ctime, reverse=True):
-        yield i
+    yield from sorted(iter_primitive(), key=attrgetter('ctime'), reverse=True)
 
 
 # actions
@@ -272,42 +266,47 @@ def show_primitive_evolution() -> None:
 
 
 def show_syscall_stats() -> None:
-    stats = {}  # type: Dict[str, Tuple[int, int]]
+    stats_total = Counter()  # type: Dict[str, int]
+    stats_error = Counter()  # type: Dict[str, int]
 
     # collect stats
     for _, syscall, record in iter_syscall_strace():
-        if syscall.name not in stats:
-            stats[syscall.name] = (0, 0)
-
-        num_error, num_total = stats[syscall.name]
-        stats[syscall.name] = (
-            num_error + (1 if record.is_error() else 0), num_total + 1
-        )
+        stats_total[syscall.name] += 1
+        if record.is_error:
+            stats_error[syscall.name] += 1
 
     # show stats
-    for k in sorted(stats.keys()):
-        num_error, num_total = stats[k]
+    for k in sorted(stats_total):
+        num_error, num_total = stats_error[k], stats_total[k]
         print('{}: {} / {} ({:2.0f}%)'.format(
             k, num_error, num_total, num_error / num_total * 100
         ))
 
 
+def _search_file(regex: Pattern[bytes], path: str) -> bool:
+    with open(path, 'rb') as f:
+        # mmap refuses to map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return regex.search(b'') is not None
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return regex.search(mm) is not None
+
+
 def find_in_program(needle: str) -> None:
-    regex = re.compile(needle)
+    regex = re.compile(needle.encode())
 
     for pack in iter_seed_exec_inc():
-        with open(os.path.join(pack.path, 'readable'), 'r') as f:
-            if regex.search(f.read()) is not None:
-                print(pack.path)
+        if _search_file(regex, os.path.join(pack.path, 'readable')):
+            print(pack.path)
 
 
 def find_in_strace(needle: str) -> None:
-    regex = re.compile(needle)
+    regex = re.compile(needle.encode())
 
     for pack in iter_seed_exec_inc():
-        with open(os.path.join(pack.path, 'strace'), 'r') as f:
-            if regex.search(f.read()) is not None:
-                print(pack.path)
+        if _search_file(regex, os.path.join(pack.path, 'strace')):
+            print(pack.path)
 
 
 def list_syscall_strace(name: str) -> None:
@@ -1,12 +1,39 @@
+from typing import Dict, List, Optional
+
 import os
+import shutil
 import logging
 
 from abc import ABC, abstractmethod
 
-from util import cd, execute0, prepdn, prepfn
+from util import execute0, prepdn, prepfn
 
 import config
 
+# git tree hashes of package sources, keyed by source path
+PACKAGE_HASH_CACHE = {}  # type: Dict[str, str]
+
+
+# compiler caching (only when ccache is available)
+def ccache_environ() -> Optional[Dict[str, str]]:
+    if shutil.which('ccache') is None:
+        return None
+
+    env = dict(os.environ)
+    env['CC'] = 'ccache {}'.format(env.get('CC', 'gcc'))
+    env['CXX'] = 'ccache {}'.format(env.get('CXX', 'g++'))
+    return env
+
+
+def ccache_cmake_options() -> List[str]:
+    if shutil.which('ccache') is None:
+        return []
+
+    return [
+        '-DCMAKE_C_COMPILER_LAUNCHER=ccache',
+        '-DCMAKE_CXX_COMPILER_LAUNCHER=ccache',
+    ]
+
 
 class Mark(object):
 
@@ -17,14 +44,18 @@ class Mark(object):
         self.hval = hval
 
     def exist(self) -> bool:
-        if not os.path.exists(self.path):
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except FileNotFoundError:
             return False
 
-        with open(self.path) as f:
-            if f.read().strip() != self.hval:
-                return False
+        # a mark only holds a short hash value
+        try:
+            data = os.read(fd, 128)
+        finally:
+            os.close(fd)
 
-        return True
+        return data.strip().decode() == self.hval
 
     def touch(self) -> None:
         prepfn(self.path)
@@ -45,9 +76,22 @@ class Package(ABC):
         self.path_store = os.path.join(config.STUDIO_STORE, self.name)
 
         # status
-        with cd(config.PROJ_PATH):
-            outs, _ = execute0(['git', 'ls-tree', 'HEAD', self.path_src])
-            self.hash = outs.strip().split()[2]
+        if self.path_src not in PACKAGE_HASH_CACHE:
+            outs, _ = execute0(
+                ['git', 'ls-tree', 'HEAD', self.path_src], cwd=config.PROJ_PATH
+            )
+            PACKAGE_HASH_CACHE[self.path_src] = outs.strip().split()[2]
+
+        self.hash = PACKAGE_HASH_CACHE[self.path_src]
+        self.prepared = False
+
+    def _prepare(self, override: bool) -> None:
+        if self.prepared and not override:
+            return
+
+        prepdn(self.path_build, override)
+        prepdn(self.path_store, override)
+        self.prepared = True
 
     @abstractmethod
     def _setup_impl(self, override: bool) -> None:
@@ -60,8 +104,7 @@ class Package(ABC):
             logging.info('Mark {} existed, do nothing'.format(mark.path))
             return
 
-        prepdn(self.path_build, True)
-        prepdn(self.path_store, True)
+        self._prepare(True)
         self._setup_impl(override)
 
         logging.info('[Done] Setup')
@@ -78,8 +121,7 @@ class Package(ABC):
             logging.info('Mark {} existed, do nothing'.format(mark.path))
             return
 
-        prepdn(self.path_build, False)
-        prepdn(self.path_store, False)
+        self._prepare(False)
         self._build_impl(override)
 
         logging.info('[Done] Build')
@@ -96,8 +138,7 @@ class Package(ABC):
             logging.info('Mark {} existed, do nothing'.format(mark.path))
             return
 
-        prepdn(self.path_build, False)
-        prepdn(self.path_store, False)
+        self._prepare(False)
         self._store_impl(override)
 
         logging.info('[Done] Store')
@@ -2,7 +2,7 @@ import os
 
 from pkg import Package
 
-from util import cd, inplace_replace, execute
+from util import inplace_replace, execute
 
 import config
 
@@ -16,44 +16,37 @@ class Package_BTRFSPROGS(Package):
         )
 
     def _setup_impl(self, override: bool = False) -> None:
-        with cd(self.path_src):
-            # TODO: disable installation of udev rules to root fs
-            inplace_replace(
-                os.path.join('configure.ac'),
-                'UDEVDIR="$(${PKG_CONFIG} udev --variable=udevdir)"',
-                os.path.join(self.path_store, 'lib', 'udev'),
-            )
-
-            execute([
-                os.path.join(self.path_src, 'autogen.sh'),
-            ])
-
-            execute([
-                os.path.join(self.path_src, 'configure'),
-                '--prefix={}'.format(self.path_store),
-                '--disable-convert',
-                '--disable-documentation',
-            ])
-
-            # TODO: revert the changes
-            inplace_replace(
-                os.path.join('configure.ac'),
-                os.path.join(self.path_store, 'lib', 'udev'),
-                'UDEVDIR="$(${PKG_CONFIG} udev --variable=udevdir)"',
-            )
+        execute([
+            os.path.join(self.path_src, 'autogen.sh'),
+        ], cwd=self.path_src)
+
+        # TODO: disable installation of udev rules to root fs
+        # NOTE: patch the generated configure so configure.ac stays intact
+        inplace_replace(
+            os.path.join(self.path_src, 'configure'),
+            'UDEVDIR="$(${PKG_CONFIG} udev --variable=udevdir)"',
+            'UDEVDIR="{}"'.format(
+                os.path.join(self.path_store, 'lib', 'udev')
+            ),
+        )
+
+        execute([
+            os.path.join(self.path_src, 'configure'),
+            '--prefix={}'.format(self.path_store),
+            '--disable-convert',
+            '--disable-documentation',
+        ], cwd=self.path_src)
 
     def _build_impl(self, override: bool = False) -> None:
-        with cd(self.path_src):
-            execute([
-                'make', '-j{}'.format(config.NCPU),
-            ])
+        execute([
+            'make', '-j{}'.format(config.NCPU),
+        ], cwd=self.path_src)
 
     def _store_impl(self, override: bool = False) -> None:
-        with cd(self.path_src):
-            execute([
-                'make', 'install',
-            ])
-
-            execute([
-                'make', 'clean-all', 'clean-gen',
-            ])
+        execute([
+            'make', 'install',
+        ], cwd=self.path_src)
+
+        execute([
+            'make', 'clean-all', 'clean-gen',
+        ], cwd=self.path_src)
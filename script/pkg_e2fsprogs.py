@@ -2,7 +2,7 @@ import os
 
 from pkg import Package
 
-from util import cd, execute
+from util import execute
 
 import config
 
@@ -16,32 +16,29 @@ class Package_E2FSPROGS(Package):
         )
 
     def _setup_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                os.path.join(self.path_src, 'configure'),
-                '--prefix={}'.format(self.path_store),
-                '--enable-elf-shlibs',
-                '--enable-libuuid',
-                '--enable-libblkid',
-                '--with-udev-rules-dir={}'.format(os.path.join(
-                    self.path_store, 'lib', 'udev', 'rules.d'
-                )),
-                '--with-crond-dir={}'.format(os.path.join(
-                    self.path_store, 'etc', 'cron.d'
-                )),
-                '--with-systemd-unit-dir={}'.format(os.path.join(
-                    self.path_store, 'lib', 'systemd', 'system'
-                )),
-            ])
+        execute([
+            os.path.join(self.path_src, 'configure'),
+            '--prefix={}'.format(self.path_store),
+            '--enable-elf-shlibs',
+            '--enable-libuuid',
+            '--enable-libblkid',
+            '--with-udev-rules-dir={}'.format(os.path.join(
+                self.path_store, 'lib', 'udev', 'rules.d'
+            )),
+            '--with-crond-dir={}'.format(os.path.join(
+                self.path_store, 'etc', 'cron.d'
+            )),
+            '--with-systemd-unit-dir={}'.format(os.path.join(
+                self.path_store, 'lib', 'systemd', 'system'
+            )),
+        ], cwd=self.path_build)
 
     def _build_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'make', '-j{}'.format(config.NCPU),
-            ])
+        execute([
+            'make', '-j{}'.format(config.NCPU),
+        ], cwd=self.path_build)
 
     def _store_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'make', 'install',
-            ])
+        execute([
+            'make', 'install',
+        ], cwd=self.path_build)
@@ -2,7 +2,7 @@ import os
 
 from pkg import Package
 
-from util import cd, execute
+from util import execute
 
 import config
 
@@ -16,30 +16,26 @@ class Package_GCC(Package):
         )
 
     def _setup_impl(self, override: bool = False) -> None:
-        with cd(self.path_src):
-            execute([
-                os.path.join('.', 'contrib', 'download_prerequisites'),
-            ])
-
-        with cd(self.path_build):
-            execute([
-                os.path.join(self.path_src, 'configure'),
-                '--prefix={}'.format(self.path_store),
-                '--enable-languages=c,c++',
-                '--enable-shared',
-                '--enable-lto',
-                '--disable-multilib',
-                '--disable-nls',
-            ])
+        execute([
+            os.path.join(self.path_src, 'contrib', 'download_prerequisites'),
+        ], cwd=self.path_src)
+
+        execute([
+            os.path.join(self.path_src, 'configure'),
+            '--prefix={}'.format(self.path_store),
+            '--enable-languages=c,c++',
+            '--enable-shared',
+            '--enable-lto',
+            '--disable-multilib',
+            '--disable-nls',
+        ], cwd=self.path_build)
 
     def _build_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'make', '-j{}'.format(config.NCPU),
-            ])
+        execute([
+            'make', '-j{}'.format(config.NCPU),
+        ], cwd=self.path_build)
 
     def _store_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'make', 'install',
-            ])
+        execute([
+            'make', 'install',
+        ], cwd=self.path_build)
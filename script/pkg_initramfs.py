@@ -1,10 +1,14 @@
+from typing import cast, IO, List
+
 import os
 import shutil
 
+from subprocess import Popen, PIPE
+
 from pkg import Package
 from pkg_linux import Package_LINUX
 
-from util import cd, prepdn, execute
+from util import prepdn, execute
 
 import config
 
@@ -24,27 +28,24 @@ class Package_INITRAMFS(Package):
         self.linux_store = os.path.join(linux.path_store)
 
     def _setup_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'cmake', os.path.join(self.path_src),
-                '-G', 'Unix Makefiles',
-                '-DCMAKE_INSTALL_PREFIX={}'.format(self.path_store),
-                '-DCMAKE_BUILD_TYPE=Release',
-                '-DLINUX_FLAVOR={}'.format(self.flavor),
-                '-DLINUX_INTENT={}'.format(self.intent),
-            ])
+        execute([
+            'cmake', os.path.join(self.path_src),
+            '-G', 'Unix Makefiles',
+            '-DCMAKE_INSTALL_PREFIX={}'.format(self.path_store),
+            '-DCMAKE_BUILD_TYPE=Release',
+            '-DLINUX_FLAVOR={}'.format(self.flavor),
+            '-DLINUX_INTENT={}'.format(self.intent),
+        ], cwd=self.path_build)
 
     def _build_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'make', '-j{}'.format(config.NCPU),
-            ])
+        execute([
+            'make', '-j{}'.format(config.NCPU),
+        ], cwd=self.path_build)
 
     def _store_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'make', 'install',
-            ])
+        execute([
+            'make', 'install',
+        ], cwd=self.path_build)
 
         # create directory layouts in initramfs
         path_initramfs = os.path.join(self.path_store, 'rootfs')
@@ -58,15 +59,21 @@ class Package_INITRAMFS(Package):
 
         # copy modules
         path_kernel_lib = os.path.join(self.linux_store, 'lib', 'modules')
-        assert len(os.listdir(path_kernel_lib)) == 1
-        kernel_version = os.listdir(path_kernel_lib)[0]
+        kernel_versions = os.listdir(path_kernel_lib)
+        assert len(kernel_versions) == 1
+        kernel_version = kernel_versions[0]
 
         path_mod = os.path.join(path_kernel_lib, kernel_version, 'kernel')
         for item in os.listdir(path_mod):
-            shutil.copytree(
-                os.path.join(path_mod, item),
-                os.path.join(path_initramfs_mod, item)
-            )
+            src = os.path.join(path_mod, item)
+            dst = os.path.join(path_initramfs_mod, item)
+
+            # hardlink when possible, fall back to copies across devices
+            try:
+                shutil.copytree(src, dst, copy_function=os.link)
+            except OSError:
+                shutil.rmtree(dst, ignore_errors=True)
+                shutil.copytree(src, dst)
 
         # copy init
         shutil.copy2(
@@ -75,7 +82,26 @@ class Package_INITRAMFS(Package):
         )
 
         # make an image
-        with cd(path_initramfs):
-            os.system(
-                'find . | cpio -o --quiet -R 0:0 -H newc | gzip > ../initrd.img'
+        with open(os.path.join(self.path_store, 'initrd.img'), 'wb') as f:
+            p1 = Popen(['find', '.'], stdout=PIPE, cwd=path_initramfs)
+            p2 = Popen(
+                ['cpio', '-o', '--quiet', '-R', '0:0', '-H', 'newc'],
+                stdin=p1.stdout, stdout=PIPE, cwd=path_initramfs
+            )
+            p3 = Popen(
+                ['pigz', '-p', str(config.NCPU)],
+                stdin=p2.stdout, stdout=f
             )
+
+            # let the downstream processes own the pipes
+            cast(IO, p1.stdout).close()
+            cast(IO, p2.stdout).close()
+
+            for p in (p3, p2, p1):
+                rc = p.wait()
+                if rc != 0:
+                    raise RuntimeError(
+                        'Failed to execute {}: exit code {}'.format(
+                            ' '.join(cast(List[str], p.args)), rc
+                        )
+                    )
@@ -6,7 +6,7 @@ import shutil
 
 from pkg import Package
 
-from util import cd, execute, execute0, find_all_files
+from util import execute, execute0, find_all_files
 
 import config
 
@@ -67,37 +67,32 @@ class Package_LINUX(Package):
         ]
 
     def _on_dev_branch(self) -> bool:
-        with cd(self.path_src):
-            outs, _ = execute0([
-                'git', 'diff', 'origin/master', '--shortstat'
-            ])
-            return len(outs.strip()) != 0
+        outs, _ = execute0([
+            'git', 'diff', 'origin/master', '--shortstat'
+        ], cwd=self.path_src)
+        return len(outs.strip()) != 0
 
     def _apply_patches(self) -> None:
         # prepare the linux kernel repo
-        with cd(self.path_src):
-            execute(['git', 'reset', '--', '.'])
-            execute(['git', 'checkout', '--', '.'])
-            execute(['git', 'clean', '-fd'])
-            execute(['git', 'checkout', config.LINUX_VERSION])
+        execute(['git', 'reset', '--', '.'], cwd=self.path_src)
+        execute(['git', 'checkout', '--', '.'], cwd=self.path_src)
+        execute(['git', 'clean', '-fd'], cwd=self.path_src)
+        execute(['git', 'checkout', config.LINUX_VERSION], cwd=self.path_src)
 
         # apply the ktsan patch (if we choose to use ktsan)
         if self.intent.ktsan:
             patch = os.path.join(self.path_src, '..', 'ktsan.patch')
-            with cd(self.path_src):
-                execute(['git', 'apply', '-3', patch])
+            execute(['git', 'apply', '-3', patch], cwd=self.path_src)
 
         # apply the racer patch
         patch = os.path.join(self.path_src, '..', 'racer.patch')
-        with cd(self.path_src):
-            execute(['git', 'apply', '-3', patch])
+        execute(['git', 'apply', '-3', patch], cwd=self.path_src)
 
     def _restore_branch(self) -> None:
-        with cd(self.path_src):
-            execute(['git', 'reset', '--', '.'])
-            execute(['git', 'checkout', '--', '.'])
-            execute(['git', 'clean', '-fd'])
-            execute(['git', 'checkout', 'master'])
+        execute(['git', 'reset', '--', '.'], cwd=self.path_src)
+        execute(['git', 'checkout', '--', '.'], cwd=self.path_src)
+        execute(['git', 'clean', '-fd'], cwd=self.path_src)
+        execute(['git', 'checkout', 'master'], cwd=self.path_src)
 
     def _setup_impl(self, override: bool = False) -> None:
         # patch if not building on our own branch
@@ -105,77 +100,69 @@ class Package_LINUX(Package):
             self._apply_patches()
 
         # standard racer_defconfig
-        with cd(self.path_src):
-            execute(['make'] + self.build_option + [
-                'O={}'.format(self.path_build),
-                'racer_defconfig',
-            ])
+        execute(['make'] + self.build_option + [
+            'O={}'.format(self.path_build),
+            'racer_defconfig',
+        ], cwd=self.path_src)
 
         # qemu-kvm configs
-        with cd(self.path_build):
-            execute(['make'] + self.build_option + [
-                'kvmconfig',
-            ])
-            execute(['make'] + self.build_option + [
-                'qemuconfig',
-            ])
+        execute(['make'] + self.build_option + [
+            'kvmconfig',
+        ], cwd=self.path_build)
+        execute(['make'] + self.build_option + [
+            'qemuconfig',
+        ], cwd=self.path_build)
 
         # flavor configs
-        with cd(self.path_build):
-            execute(['make'] + self.build_option + [
-                'racer_{}_config'.format(self.flavor)
-            ])
+        execute(['make'] + self.build_option + [
+            'racer_{}_config'.format(self.flavor)
+        ], cwd=self.path_build)
 
         # checker configs
-        with cd(self.path_build):
-
-            if self.intent.ktsan:
-                execute(['make'] + self.build_option + [
-                    'check_ktsan_config',
-                ])
+        if self.intent.ktsan:
+            execute(['make'] + self.build_option + [
+                'check_ktsan_config',
+            ], cwd=self.path_build)
 
-            if self.intent.kasan:
-                execute(['make'] + self.build_option + [
-                    'check_kasan_config',
-                ])
+        if self.intent.kasan:
+            execute(['make'] + self.build_option + [
+                'check_kasan_config',
+            ], cwd=self.path_build)
 
-            if self.intent.lockdep:
-                execute(['make'] + self.build_option + [
-                    'check_lockdep_config',
-                ])
+        if self.intent.lockdep:
+            execute(['make'] + self.build_option + [
+                'check_lockdep_config',
+            ], cwd=self.path_build)
 
         # enable dart
-        with cd(self.path_build):
-            execute(['make'] + self.build_option + [
-                'dart_devel_config' if self.intent.devel else 'dart_config'
-            ])
+        execute(['make'] + self.build_option + [
+            'dart_devel_config' if self.intent.devel else 'dart_config'
+        ], cwd=self.path_build)
 
     def _build_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute(['make'] + self.build_option + [
-                '-j{}'.format(config.NCPU),
-            ])
+        execute(['make'] + self.build_option + [
+            '-j{}'.format(config.NCPU),
+        ], cwd=self.path_build)
 
         # NOTE: clean out of the compilation databases
         for item in find_all_files(
                 self.path_build,
-                re.compile(r'^racer-compile-database-.*\.pickle$')
+                re.compile(r'^racer-compile-database(-.*)?\.pickle$')
         ):
             os.unlink(item)
 
     def _store_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            # install headers and modules
-            execute([
-                'make',
-                'INSTALL_HDR_PATH={}'.format(self.path_store),
-                'headers_install',
-            ])
-            execute([
-                'make',
-                'INSTALL_MOD_PATH={}'.format(self.path_store),
-                'modules_install',
-            ])
+        # install headers and modules
+        execute([
+            'make',
+            'INSTALL_HDR_PATH={}'.format(self.path_store),
+            'headers_install',
+        ], cwd=self.path_build)
+        execute([
+            'make',
+            'INSTALL_MOD_PATH={}'.format(self.path_store),
+            'modules_install',
+        ], cwd=self.path_build)
 
         # install bzImage
         path_bin = os.path.join(self.path_store, 'bin')
@@ -194,35 +181,38 @@ class Package_LINUX(Package):
     def module_order(self, mods: List[str]) -> List[str]:
         # extract module dependencies
         path_lib = os.path.join(self.path_store, 'lib', 'modules')
-        assert len(os.listdir(path_lib)) == 1
-        version = os.listdir(path_lib)[0]
+        versions = os.listdir(path_lib)
+        assert len(versions) == 1
+        version = versions[0]
 
         deps_info = {}  # type: Dict[str, List[str]]
         path_mdep = os.path.join(path_lib, version, 'modules.dep')
         with open(path_mdep, 'r') as f:
             for line in f:
-                line = line.strip()
-                toks = line.split(':')
-                assert len(toks) == 2
-                deps_info[toks[0]] = toks[1].strip().split()
-
-        # construct the correct module loading order
-        pend = set()  # type: Set[str]
-        for m in mods:
-            pend.update(deps_info[m])
-
-        def _r(info: Dict[str, List[str]], hist: List[str], item: str) -> None:
-            if item in hist:
-                return
-
-            for i in info[item]:
-                _r(info, hist, i)
-
-            hist.append(item)
+                name, sep, deps = line.partition(':')
+                assert len(sep) != 0
+                deps_info[name.strip()] = deps.split()
 
+        # construct the correct module loading order (DFS post-order)
         deps = []  # type: List[str]
+        hist = set()  # type: Set[str]
+
         for m in mods:
-            for i in deps_info[m]:
-                _r(deps_info, deps, i)
+            for root in deps_info[m]:
+                if root in hist:
+                    continue
+
+                hist.add(root)
+                stack = [(root, iter(deps_info[root]))]
+                while len(stack) != 0:
+                    item, todo = stack[-1]
+                    for i in todo:
+                        if i not in hist:
+                            hist.add(i)
+                            stack.append((i, iter(deps_info[i])))
+                            break
+                    else:
+                        stack.pop()
+                        deps.append(item)
 
         return [i.replace('kernel/', '/mod/') for i in deps]
@@ -2,7 +2,7 @@ import os
 
 from pkg import Package
 
-from util import cd, execute
+from util import execute
 
 import config
 
@@ -16,34 +16,31 @@ class Package_LLVM(Package):
         )
 
     def _setup_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'cmake', os.path.join(self.path_src, 'llvm'),
-                '-G', 'Unix Makefiles',
-                '-DLLVM_ENABLE_PROJECTS={}'.format(';'.join([
-                    'clang',
-                    'clang-tools-extra',
-                    'compiler-rt',
-                    'lld',
-                    'polly',
-                ])),
-                '-DCMAKE_INSTALL_PREFIX={}'.format(self.path_store),
-                '-DCMAKE_BUILD_TYPE=Release',
-                '-DBUILD_SHARED_LIBS=On',
-                '-DLLVM_ENABLE_RTTI=On',
-                '-DLLVM_ENABLE_EH=On',
-                '-DLLVM_ENABLE_THREADS=On',
-                '-DLLVM_ENABLE_CXX1Y=On',
-            ])
+        execute([
+            'cmake', os.path.join(self.path_src, 'llvm'),
+            '-G', 'Unix Makefiles',
+            '-DLLVM_ENABLE_PROJECTS={}'.format(';'.join([
+                'clang',
+                'clang-tools-extra',
+                'compiler-rt',
+                'lld',
+                'polly',
+            ])),
+            '-DCMAKE_INSTALL_PREFIX={}'.format(self.path_store),
+            '-DCMAKE_BUILD_TYPE=Release',
+            '-DBUILD_SHARED_LIBS=On',
+            '-DLLVM_ENABLE_RTTI=On',
+            '-DLLVM_ENABLE_EH=On',
+            '-DLLVM_ENABLE_THREADS=On',
+            '-DLLVM_ENABLE_CXX1Y=On',
+        ], cwd=self.path_build)
 
     def _build_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'make', '-j{}'.format(config.NCPU),
-            ])
+        execute([
+            'make', '-j{}'.format(config.NCPU),
+        ], cwd=self.path_build)
 
     def _store_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'make', 'install',
-            ])
+        execute([
+            'make', 'install',
+        ], cwd=self.path_build)
@@ -1,8 +1,8 @@
 import os
 
-from pkg import Package
+from pkg import Package, ccache_environ
 
-from util import cd, execute
+from util import execute
 
 import config
 
@@ -16,23 +16,26 @@ class Package_QEMU(Package):
         )
 
     def _setup_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                os.path.join(self.path_src, 'configure'),
-                '--prefix={}'.format(self.path_store),
-                '--enable-kvm',
-                '--enable-virtfs',
-                '--target-list=x86_64-softmmu',
-            ])
+        execute([
+            os.path.join(self.path_src, 'configure'),
+            '--prefix={}'.format(self.path_store),
+            '--enable-kvm',
+            '--enable-virtfs',
+            '--target-list=x86_64-softmmu',
+        ], cwd=self.path_build, env=ccache_environ())
+
+    def _use_ninja(self) -> bool:
+        # meson-based qemu generates a ninja build, make only wraps it
+        return os.path.exists(os.path.join(self.path_build, 'build.ninja'))
 
     def _build_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'make', '-j{}'.format(config.NCPU),
-            ])
+        execute([
+            'ninja' if self._use_ninja() else 'make',
+            '-j{}'.format(config.NCPU),
+        ], cwd=self.path_build)
 
     def _store_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'make', 'install',
-            ])
+        execute([
+            'ninja' if self._use_ninja() else 'make',
+            'install',
+        ], cwd=self.path_build)
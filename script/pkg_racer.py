@@ -1,8 +1,8 @@
 import os
 
-from pkg import Package
+from pkg import Package, ccache_cmake_options
 
-from util import cd, execute
+from util import execute
 
 import config
 
@@ -16,23 +16,20 @@ class Package_Racer(Package):
         )
 
     def _setup_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'cmake', os.path.join(self.path_src),
-                '-G', 'Unix Makefiles',
-                '-DCMAKE_INSTALL_PREFIX={}'.format(self.path_store),
-                '-DCMAKE_BUILD_TYPE=Release',
-                self.path_src,
-            ])
+        execute([
+            'cmake', os.path.join(self.path_src),
+            '-G', 'Ninja',
+            '-DCMAKE_INSTALL_PREFIX={}'.format(self.path_store),
+            '-DCMAKE_BUILD_TYPE=Release',
+            self.path_src,
+        ] + ccache_cmake_options(), cwd=self.path_build)
 
     def _build_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'make', '-j{}'.format(config.NCPU),
-            ])
+        execute([
+            'ninja', '-j{}'.format(config.NCPU),
+        ], cwd=self.path_build)
 
     def _store_impl(self, override: bool = False) -> None:
-        with cd(self.path_build):
-            execute([
-                'make', 'install',
-            ])
+        execute([
+            'ninja', 'install',
+        ], cwd=self.path_build)
@@ -1,8 +1,8 @@
 import os
 
-from pkg import Package
+from pkg import Package, ccache_environ
 
-from util import cd, execute
+from util import execute
 
 import config
 
@@ -16,38 +16,41 @@ class Package_XFSPROGS(Package):
         )
 
     def _setup_impl(self, override: bool = False) -> None:
-        with cd(self.path_src):
-            execute([
-                'make', 'configure',
-            ])
-
-            execute([
-                os.path.join(self.path_src, 'configure'),
-                '--prefix={}'.format(self.path_store),
-                '--with-crond-dir={}'.format(os.path.join(
-                    self.path_store, 'etc', 'cron.d'
-                )),
-                '--with-systemd-unit-dir={}'.format(os.path.join(
-                    self.path_store, 'lib', 'systemd', 'system'
-                )),
-            ])
+        # drop cached autoconf probes only on explicit request
+        path_cache = os.path.join(self.path_src, 'config.cache')
+        if override and os.path.exists(path_cache):
+            os.unlink(path_cache)
+
+        execute([
+            'make', 'configure',
+        ], cwd=self.path_src)
+
+        execute([
+            os.path.join(self.path_src, 'configure'),
+            '--config-cache',
+            '--prefix={}'.format(self.path_store),
+            '--with-crond-dir={}'.format(os.path.join(
+                self.path_store, 'etc', 'cron.d'
+            )),
+            '--with-systemd-unit-dir={}'.format(os.path.join(
+                self.path_store, 'lib', 'systemd', 'system'
+            )),
+        ], cwd=self.path_src, env=ccache_environ())
 
     def _build_impl(self, override: bool = False) -> None:
-        with cd(self.path_src):
-            execute([
-                'make', '-j{}'.format(config.NCPU),
-            ])
+        execute([
+            'make', '-j{}'.format(config.NCPU),
+        ], cwd=self.path_src)
 
     def _store_impl(self, override: bool = False) -> None:
-        with cd(self.path_src):
-            execute([
-                'make', 'install',
-            ])
-
-            execute([
-                'make', 'install-dev',
-            ])
-
-            execute([
-                'make', 'clean',
-            ])
+        execute([
+            'make', 'install',
+        ], cwd=self.path_src)
+
+        execute([
+            'make', 'install-dev',
+        ], cwd=self.path_src)
+
+        execute([
+            'make', 'clean',
+        ], cwd=self.path_src)
@@ -1,25 +1,33 @@
 #!/usr/bin/env python3
 
-from typing import List, Set, Dict, Iterator, cast, Optional
+from typing import cast, Any, Union, List, Set, Dict, Tuple, Iterator, \
+    Optional
 
 import re
 import os
-import sys
-import json
+import mmap
 import pickle
 
-from collections import OrderedDict
+from functools import partial
+from collections import deque
 
-from util import find_all_files
+from util import find_all_files, parallelize_iter
 
-# sys config
-sys.setrecursionlimit(10000)
+# prefer the C-accelerated json parser when it is installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    import json
+
+    def json_loads(raw: Union[bytes, memoryview]) -> Any:  # type: ignore
+        # the stdlib parser does not take buffers, copy them out first
+        return json.loads(bytes(raw))
 
 RE_RACER_COMPILE_LOG_FILE = re.compile(r'^(.*)\.racer$')
-RE_RACER_COMPILE_INST_LOC = re.compile(r'^(.*?) @\[ (.*?) \]$')
 
 
 class Value(object):
+    __slots__ = ('hval', 'parent')
 
     def __init__(self, hval: int) -> None:
         self.hval = hval
@@ -28,26 +36,58 @@ class Value(object):
     def set_parent(self, parent: 'Value') -> None:
         self.parent = parent
 
+    # pickling: slotted objects carry no __dict__, collect the slots instead
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {}  # type: Dict[str, Any]
+        for cls in type(self).__mro__:
+            for k in getattr(cls, '__slots__', ()):
+                if hasattr(self, k):
+                    state[k] = getattr(self, k)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for k, v in state.items():
+            setattr(self, k, v)
+
 
 class ValueInst(Value):
+    __slots__ = ('info', 'text', '_locs')
 
     def __init__(self, hval: int, info: List[str], text: str) -> None:
         super(ValueInst, self).__init__(hval)
         self.info = info
         self.text = text
+        self._locs = ' @@ '.join(info)
 
     def get_parent(self) -> 'ValueBlock':
         return cast(ValueBlock, self.parent)
 
     def get_locs(self) -> str:
-        return ' @@ '.join(self.info)
+        return self._locs
+
+    def __reduce_ex__(self, protocol: int) -> Union[str, Tuple[Any, ...]]:
+        block = cast(Optional[ValueBlock], self.parent)
+        func = None if block is None else block.get_parent()
+        module = None if func is None else func.get_parent()
+        if block is None or func is None or module is None:
+            return super(ValueInst, self).__reduce_ex__(protocol)
+
+        return _locate_inst, (module, func.name, block.hval, self.hval)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        super(ValueInst, self).__setstate__(state)
+
+        # caches pickled before memoization do not carry the joined locs
+        if '_locs' not in state:
+            self._locs = ' @@ '.join(self.info)
 
 
 class ValueBlock(Value):
+    __slots__ = ('insts', 'preds', 'succs')
 
     def __init__(self, hval: int) -> None:
         super(ValueBlock, self).__init__(hval)
-        self.insts = OrderedDict()  # type: OrderedDict[int, ValueInst]
+        self.insts = {}  # type: Dict[int, ValueInst]
         self.preds = []  # type: List[ValueBlock]
         self.succs = []  # type: List[ValueBlock]
 
@@ -66,13 +106,22 @@ class ValueBlock(Value):
     def get_parent(self) -> 'ValueFunc':
         return cast(ValueFunc, self.parent)
 
+    def __reduce_ex__(self, protocol: int) -> Union[str, Tuple[Any, ...]]:
+        func = cast(Optional[ValueFunc], self.parent)
+        module = None if func is None else func.get_parent()
+        if func is None or module is None:
+            return super(ValueBlock, self).__reduce_ex__(protocol)
+
+        return _locate_block, (module, func.name, self.hval)
+
 
 class ValueFunc(Value):
+    __slots__ = ('name', 'blocks', 'entry', 'exits')
 
     def __init__(self, hval: int, name: str) -> None:
         super(ValueFunc, self).__init__(hval)
         self.name = name
-        self.blocks = OrderedDict()  # type: OrderedDict[int, ValueBlock]
+        self.blocks = {}  # type: Dict[int, ValueBlock]
         self.entry = None  # type: Optional[ValueBlock]
         self.exits = set()  # type: Set[ValueBlock]
 
@@ -83,6 +132,13 @@ class ValueFunc(Value):
     def get_parent(self) -> 'ValueModule':
         return cast(ValueModule, self.parent)
 
+    def __reduce_ex__(self, protocol: int) -> Union[str, Tuple[Any, ...]]:
+        module = cast(Optional[ValueModule], self.parent)
+        if module is None:
+            return super(ValueFunc, self).__reduce_ex__(protocol)
+
+        return _locate_func, (module, self.name)
+
     def set_entry(self) -> None:
         for b in self.blocks.values():
             if len(b.preds) == 0:
@@ -106,16 +162,16 @@ class ValueFunc(Value):
         # build cfg
         assert self.entry is not None
 
-        queue = [self.entry]
+        queue = deque([self.entry])
         visit = {self.entry}
 
         while len(queue) != 0:
             # handle linkage
-            node = queue.pop()
+            node = queue.popleft()
             for item in node.succs:
                 if item not in visit:
                     visit.add(item)
-                    queue.insert(0, item)
+                    queue.append(item)
 
             # dump instructions
             print('{}: pred <{}>, succ <{}>'.format(
@@ -134,6 +190,9 @@ class ValueFunc(Value):
 
 
 class ValueModule(Value):
+    __slots__ = (
+        'name', 'apis', 'gvar', 'structs', 'funcsByHval', 'funcsByName'
+    )
 
     def __init__(self, hval: int,
                  name: str,
@@ -145,8 +204,8 @@ class ValueModule(Value):
         self.gvar = gvar
         self.structs = structs
 
-        self.funcsByHval = OrderedDict()  # type: OrderedDict[int, ValueFunc]
-        self.funcsByName = OrderedDict()  # type: OrderedDict[str, ValueFunc]
+        self.funcsByHval = {}  # type: Dict[int, ValueFunc]
+        self.funcsByName = {}  # type: Dict[str, ValueFunc]
 
     def add_func(self, func: ValueFunc) -> None:
         self.funcsByHval[func.hval] = func
@@ -156,66 +215,162 @@ class ValueModule(Value):
     def get_parent(self) -> None:
         return None
 
+    # pickling: the whole module is flattened into a table keyed by hval so
+    # that pickling deep CFGs does not recurse through preds/succs
+    def __getstate__(self) -> Dict[str, Any]:
+        funcs = []  # type: List[Tuple[Any, ...]]
+        for func in self.funcsByName.values():
+            blocks = [(
+                block.hval,
+                [(i.hval, i.info, i.text) for i in block.insts.values()],
+                [i.hval for i in block.preds],
+                [i.hval for i in block.succs],
+            ) for block in func.blocks.values()]
+
+            funcs.append((
+                func.hval, func.name, blocks,
+                None if func.entry is None else func.entry.hval,
+                [i.hval for i in func.exits],
+            ))
 
-def iter_compile_logs_by_module(path: str) -> Iterator[ValueModule]:
-    for fn in find_all_files(path, RE_RACER_COMPILE_LOG_FILE):
-        with open(fn) as f:
-            data = json.load(f)
-
-            # pass 1: create the nodes
-            meta = data['meta']
-            module = ValueModule(
-                meta['seed'],
-                fn[len(path):],
-                meta['apis'], meta['gvar'], meta['structs']
-            )
-            for k, v in data['funcs'].items():
-                func = ValueFunc(v['meta']['hash'], k)
-                module.add_func(func)
+        return {
+            'hval': self.hval,
+            'name': self.name,
+            'apis': self.apis,
+            'gvar': self.gvar,
+            'structs': self.structs,
+            'funcs': funcs,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # caches pickled before flattening hold the plain attributes
+        if 'funcs' not in state:
+            super(ValueModule, self).__setstate__(state)
+            return
+
+        ValueModule.__init__(
+            self, state['hval'],
+            state['name'],
+            state['apis'], state['gvar'], state['structs']
+        )
+
+        for fhval, name, blocks, entry, exits in state['funcs']:
+            func = ValueFunc(fhval, name)
+            self.add_func(func)
+
+            for bhval, insts, _, _ in blocks:
+                block = ValueBlock(bhval)
+                func.add_block(block)
+
+                for ihval, info, text in insts:
+                    block.add_inst(ValueInst(ihval, info, text))
+
+            for bhval, _, preds, succs in blocks:
+                block = func.blocks[bhval]
+                block.preds = [func.blocks[i] for i in preds]
+                block.succs = [func.blocks[i] for i in succs]
+
+            func.entry = None if entry is None else func.blocks[entry]
+            func.exits = {func.blocks[i] for i in exits}
+
+
+def _locate_func(module: ValueModule, name: str) -> ValueFunc:
+    return module.funcsByName[name]
+
+
+def _locate_block(module: ValueModule, name: str, hval: int) -> ValueBlock:
+    return module.funcsByName[name].blocks[hval]
+
+
+def _locate_inst(
+        module: ValueModule, name: str, block: int, hval: int
+) -> ValueInst:
+    return module.funcsByName[name].blocks[block].insts[hval]
+
+
+def parse_compile_log(
+        path: str, fn: str, raw: Union[bytes, memoryview]
+) -> ValueModule:
+    data = json_loads(raw)
+
+    # pass 1: create the nodes
+    meta = data['meta']
+    module = ValueModule(
+        meta['seed'],
+        fn[len(path):],
+        meta['apis'], meta['gvar'], meta['structs']
+    )
+    for k, v in data['funcs'].items():
+        func = ValueFunc(v['meta']['hash'], k)
+        module.add_func(func)
+
+        for b in v['blocks']:
+            block = ValueBlock(b['hash'])
+            func.add_block(block)
+
+            for i in b['inst']:
+                # parse source locations, in the form of
+                #   <loc-n> @[ ... @[ <loc-1> @[ <loc-0> ] ] ... ]
+                info = i['info'].split(' @[ ')
+                if len(info) != 1:
+                    tail = ' ]' * (len(info) - 1)
+                    assert info[-1].endswith(tail)
+                    info[-1] = info[-1][:-len(tail)]
+                    info.reverse()
+
+                inst = ValueInst(i['hash'], info, i['repr'])
+                block.add_inst(inst)
+
+    # pass 2: create the edges
+    for k, v in data['funcs'].items():
+        func = module.funcsByName[k]
 
-                for b in v['blocks']:
-                    block = ValueBlock(b['hash'])
-                    func.add_block(block)
+        for b in v['blocks']:
+            block = func.blocks[b['hash']]
 
-                    for i in b['inst']:
-                        # parse source locations
-                        info = []  # type: List[str]
-                        locs = i['info']
-                        while '@' in locs:
-                            m = RE_RACER_COMPILE_INST_LOC.match(locs)
-                            assert m is not None
-                            info.insert(0, m.group(1))
-                            locs = m.group(2)
-                        info.insert(0, locs)
+            for x in b['pred']:
+                block.add_pred(func.blocks[x])
 
-                        inst = ValueInst(i['hash'], info, i['repr'])
-                        block.add_inst(inst)
+    # pass 3: check the edges
+    for k, v in data['funcs'].items():
+        func = module.funcsByName[k]
 
-            # pass 2: create the edges
-            for k, v in data['funcs'].items():
-                func = module.funcsByName[k]
+        for b in v['blocks']:
+            block = func.blocks[b['hash']]
 
-                for b in v['blocks']:
-                    block = func.blocks[b['hash']]
+            for x in b['succ']:
+                block.add_succ(func.blocks[x])
 
-                    for x in b['pred']:
-                        block.add_pred(func.blocks[x])
+        func.set_entry()
+        func.set_exits()
 
-            # pass 3: check the edges
-            for k, v in data['funcs'].items():
-                func = module.funcsByName[k]
+    # finish
+    return module
 
-                for b in v['blocks']:
-                    block = func.blocks[b['hash']]
 
-                    for x in b['succ']:
-                        block.add_succ(func.blocks[x])
+def _load_compile_log(path: str, fn: str) -> ValueModule:
+    with open(fn, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return parse_compile_log(path, fn, b'')
 
-                func.set_entry()
-                func.set_exits()
+        # map the log and let the parser page it in instead of copying it
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return parse_compile_log(path, fn, view)
 
-            # finish
-            yield module
+
+def iter_compile_logs_raw(path: str) -> Iterator[Tuple[str, bytes]]:
+    for fn in find_all_files(path, RE_RACER_COMPILE_LOG_FILE):
+        with open(fn, 'rb') as f:
+            yield fn, f.read()
+
+
+def iter_compile_logs_by_module(path: str) -> Iterator[ValueModule]:
+    # each compile log is self-contained, parse them in parallel
+    yield from parallelize_iter(
+        partial(_load_compile_log, path),
+        find_all_files(path, RE_RACER_COMPILE_LOG_FILE)
+    )
 
 
 def iter_compile_logs_by_func(path: str) -> Iterator[ValueFunc]:
@@ -236,85 +391,102 @@ def iter_compile_logs_by_inst(path: str) -> Iterator[ValueInst]:
             yield inst
 
 
-def hmap_compile_logs_by_inst(path: str) -> Dict[int, ValueInst]:
-    cache = os.path.join(path, 'racer-compile-database-by-inst.pickle')
+def hmap_compile_logs_all(
+        path: str
+) -> Tuple[Dict[int, ValueInst], Dict[int, ValueBlock], Dict[int, ValueFunc]]:
+    cache = os.path.join(path, 'racer-compile-database.pickle')
     if os.path.exists(cache):
         with open(cache, 'rb') as f:
-            return cast(Dict[int, ValueInst], pickle.load(f))
+            return cast(
+                Tuple[
+                    Dict[int, ValueInst],
+                    Dict[int, ValueBlock],
+                    Dict[int, ValueFunc]
+                ],
+                pickle.load(f)
+            )
 
-    data = {}  # type: Dict[int, ValueInst]
+    # fallback to the per-map caches produced by earlier versions
+    legacy = [
+        os.path.join(path, 'racer-compile-database-by-{}.pickle'.format(k))
+        for k in ['inst', 'block', 'func']
+    ]
+    if all(os.path.exists(i) for i in legacy):
+        maps = []  # type: List[Any]
+        for i in legacy:
+            with open(i, 'rb') as f:
+                maps.append(pickle.load(f))
+
+        return (
+            cast(Dict[int, ValueInst], maps[0]),
+            cast(Dict[int, ValueBlock], maps[1]),
+            cast(Dict[int, ValueFunc], maps[2]),
+        )
+
+    insts = {}  # type: Dict[int, ValueInst]
+    blocks = {}  # type: Dict[int, ValueBlock]
+    funcs = {}  # type: Dict[int, ValueFunc]
+
+    # build all maps in a single pass over the compile logs
+    for func in iter_compile_logs_by_func(path):
+        hval = func.hval
 
-    for inst in iter_compile_logs_by_inst(path):
-        hval = inst.hval
+        if hval in funcs:
+            print('Conflicting hash code for func: {}'.format(hval))
+            print('Func 1: in module {}'.format(func.get_parent().name))
+            print('Func 2: in module {}'.format(funcs[hval].get_parent().name))
 
-        if hval in data:
-            print('Conflicting hash code for instruction: {}'.format(hval))
-            print('Inst 1: {} - {}'.format(
-                inst.get_locs(), inst.text
-            ))
-            print('Inst 2: {} - {}'.format(
-                data[hval].get_locs(), data[hval].text
-            ))
+        funcs[hval] = func
 
-        data[hval] = inst
+        for block in func.blocks.values():
+            hval = block.hval
 
-    with open(cache, 'wb') as f:
-        pickle.dump(data, f)
+            if hval in blocks:
+                print('Conflicting hash code for block: {}'.format(hval))
+                print('Block 1: in func {}'.format(block.get_parent().name))
+                print('Block 2: in func {}'.format(
+                    blocks[hval].get_parent().name
+                ))
 
-    return data
+            blocks[hval] = block
 
+            for inst in block.insts.values():
+                hval = inst.hval
 
-def hmap_compile_logs_by_block(path: str) -> Dict[int, ValueBlock]:
-    cache = os.path.join(path, 'racer-compile-database-by-block.pickle')
-    if os.path.exists(cache):
-        with open(cache, 'rb') as f:
-            return cast(Dict[int, ValueBlock], pickle.load(f))
+                if hval in insts:
+                    print('Conflicting hash code for instruction: {}'.format(
+                        hval
+                    ))
+                    print('Inst 1: {} - {}'.format(
+                        inst.get_locs(), inst.text
+                    ))
+                    print('Inst 2: {} - {}'.format(
+                        insts[hval].get_locs(), insts[hval].text
+                    ))
 
-    data = {}  # type: Dict[int, ValueBlock]
-
-    for block in iter_compile_logs_by_block(path):
-        hval = block.hval
-
-        if hval in data:
-            print('Conflicting hash code for block: {}'.format(hval))
-            print('Block 1: in func {}'.format(block.get_parent().name))
-            print('Block 2: in func {}'.format(data[hval].get_parent().name))
-
-        data[hval] = block
+                insts[hval] = inst
 
     with open(cache, 'wb') as f:
-        pickle.dump(data, f)
-
-    return data
+        pickle.dump(
+            (insts, blocks, funcs), f, protocol=pickle.HIGHEST_PROTOCOL
+        )
 
+    return insts, blocks, funcs
 
-def hmap_compile_logs_by_func(path: str) -> Dict[int, ValueFunc]:
-    cache = os.path.join(path, 'racer-compile-database-by-func.pickle')
-    if os.path.exists(cache):
-        with open(cache, 'rb') as f:
-            return cast(Dict[int, ValueFunc], pickle.load(f))
-
-    data = {}  # type: Dict[int, ValueFunc]
 
-    for func in iter_compile_logs_by_func(path):
-        hval = func.hval
+def hmap_compile_logs_by_inst(path: str) -> Dict[int, ValueInst]:
+    return hmap_compile_logs_all(path)[0]
 
-        if hval in data:
-            print('Conflicting hash code for func: {}'.format(hval))
-            print('Func 1: in module {}'.format(func.get_parent().name))
-            print('Func 2: in module {}'.format(data[hval].get_parent().name))
 
-        data[hval] = func
+def hmap_compile_logs_by_block(path: str) -> Dict[int, ValueBlock]:
+    return hmap_compile_logs_all(path)[1]
 
-    with open(cache, 'wb') as f:
-        pickle.dump(data, f)
 
-    return data
+def hmap_compile_logs_by_func(path: str) -> Dict[int, ValueFunc]:
+    return hmap_compile_logs_all(path)[2]
 
 
 class CompileDatabase(object):
 
     def __init__(self, path: str) -> None:
-        self.insts = hmap_compile_logs_by_inst(path)
-        self.funcs = hmap_compile_logs_by_func(path)
-        self.blocks = hmap_compile_logs_by_block(path)
+        self.insts, self.blocks, self.funcs = hmap_compile_logs_all(path)
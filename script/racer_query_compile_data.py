@@ -1,50 +1,106 @@
 #!/usr/bin/env python3
 
-from typing import List, Set
+from typing import IO, List, Set, Iterable, Iterator, Optional
 
+import os
 import sys
+import json
+import heapq
+import shutil
+import tempfile
+import subprocess
 
 from argparse import ArgumentParser
+from itertools import islice
 
 from pkg_linux import Package_LINUX
 
 from racer_parse_compile_data import \
+    RE_RACER_COMPILE_LOG_FILE, \
+    ValueInst, \
+    parse_compile_log, \
+    iter_compile_logs_raw, \
     iter_compile_logs_by_module, \
-    iter_compile_logs_by_func, \
-    iter_compile_logs_by_block, \
-    iter_compile_logs_by_inst
+    iter_compile_logs_by_inst, \
+    hmap_compile_logs_by_inst, \
+    hmap_compile_logs_by_block
+
+from util import find_all_files
 
 
 def find_instruction(path: str, goal: str) -> None:
     hval = int(goal)
+    insts = hmap_compile_logs_by_inst(path)
 
-    for block in iter_compile_logs_by_block(path):
-        if hval in block.insts:
-            func = block.get_parent()
-            print('Instruction: ' + block.insts[hval].text)
-            print('Function: ' + func.name)
-            print('--------')
-            func.show_cfg({hval})
-            return
+    if hval in insts:
+        func = insts[hval].get_parent().get_parent()
+        print('Instruction: ' + insts[hval].text)
+        print('Function: ' + func.name)
+        print('--------')
+        func.show_cfg({hval})
+        return
 
     print('Instruction not found')
 
 
 def find_block(path: str, goal: str) -> None:
     hval = int(goal)
+    blocks = hmap_compile_logs_by_block(path)
 
-    for func in iter_compile_logs_by_func(path):
-        if hval in func.blocks:
-            print('Function: ' + func.name)
-            print('--------')
-            func.show_cfg(set(func.blocks[hval].insts.keys()))
-            return
+    if hval in blocks:
+        func = blocks[hval].get_parent()
+        print('Function: ' + func.name)
+        print('--------')
+        func.show_cfg(set(blocks[hval].insts.keys()))
+        return
 
     print('Block not found')
 
 
-def find_string(path: str, goal: str) -> None:
-    for inst in iter_compile_logs_by_inst(path):
+def _grep_compile_logs(path: str, goal: str) -> List[str]:
+    # the logs are JSON, so look for the goal as it appears escaped in there
+    text = json.dumps(goal)[1:-1]
+
+    # rg honors .gitignore and skips hidden files by default, grep does not
+    if shutil.which('rg') is not None:
+        cmd = [
+            'rg', '-lF', '--no-messages', '--no-ignore', '--hidden',
+            '-g', '*.racer', '--', text, path,
+        ]
+    else:
+        cmd = ['grep', '-rlF', '--include=*.racer', '--', text, path]
+
+    # exit code 1 simply means nothing matched
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, universal_newlines=True)
+    if proc.returncode not in {0, 1}:
+        raise RuntimeError('Failed to execute {}: exit code {}'.format(
+            ' '.join(cmd), proc.returncode
+        ))
+
+    hits = {os.path.abspath(i) for i in proc.stdout.splitlines()}
+    return [
+        i for i in find_all_files(path, RE_RACER_COMPILE_LOG_FILE)
+        if os.path.abspath(i) in hits
+    ]
+
+
+def _iter_insts(path: str, goal: str, fast: bool) -> Iterator[ValueInst]:
+    if not fast:
+        yield from hmap_compile_logs_by_inst(path).values()
+        return
+
+    # only parse the compile logs that contain the goal verbatim
+    for fn in _grep_compile_logs(path, goal):
+        with open(fn, 'rb') as f:
+            module = parse_compile_log(path, fn, f.read())
+
+        for func in module.funcsByName.values():
+            for block in func.blocks.values():
+                yield from block.insts.values()
+
+
+def find_string(path: str, goal: str, fast: bool = False) -> None:
+    for inst in _iter_insts(path, goal, fast):
         if goal in inst.text:
             func = inst.get_parent().get_parent()
             print('Instruction: ' + inst.text)
@@ -56,8 +112,8 @@ def find_string(path: str, goal: str) -> None:
     print('String not found')
 
 
-def find_location(path: str, goal: str) -> None:
-    for inst in iter_compile_logs_by_inst(path):
+def find_location(path: str, goal: str, fast: bool = False) -> None:
+    for inst in _iter_insts(path, goal, fast):
         if goal in inst.get_locs():
             func = inst.get_parent().get_parent()
             print('Instruction: ' + inst.text)
@@ -71,12 +127,22 @@ def find_location(path: str, goal: str) -> None:
 
 def find_function(path: str, goal: str) -> None:
     try:
-        hval = int(goal)
+        hval = int(goal)  # type: Optional[int]
     except ValueError:
-        hval = 0
+        hval = None
 
-    for module in iter_compile_logs_by_module(path):
-        if hval in module.funcsByHval:
+    # only build the module whose raw log mentions the goal
+    needles = {goal.encode()}
+    if hval is not None:
+        needles.add(str(hval).encode())
+
+    for fn, raw in iter_compile_logs_raw(path):
+        if not any(n in raw for n in needles):
+            continue
+
+        module = parse_compile_log(path, fn, raw)
+
+        if hval is not None and hval in module.funcsByHval:
             module.funcsByHval[hval].show_cfg()
             return
 
@@ -87,48 +153,103 @@ def find_function(path: str, goal: str) -> None:
     print('Function not found')
 
 
+def _emit(items: Iterable[str], chunk: int = 1 << 12) -> None:
+    # write in joined batches instead of one print per line
+    stream = iter(items)
+    while True:
+        batch = list(islice(stream, chunk))
+        if len(batch) == 0:
+            break
+        sys.stdout.write('\n'.join(batch) + '\n')
+
+
 def list_module(path: str) -> None:
     mods = set()  # type: Set[str]
 
     for module in iter_compile_logs_by_module(path):
         mods.add(module.name)
 
-    for i in sorted(mods):
-        print(i)
+    _emit(sorted(mods))
+
+
+class SortedSpill(object):
+    """
+    Collects strings into sorted runs spilled to temporary files once a run
+    grows beyond the limit, and drains them as one sorted, unique stream
+    """
+
+    def __init__(self, limit: int = 1 << 20) -> None:
+        self.limit = limit
+        self.pending = set()  # type: Set[str]
+        self.runs = []  # type: List[IO[str]]
+
+    def update(self, items: Iterable[str]) -> None:
+        self.pending.update(items)
+        if len(self.pending) < self.limit:
+            return
+
+        run = tempfile.TemporaryFile('w+')
+        run.writelines(i + '\n' for i in sorted(self.pending))
+        run.seek(0)
+
+        self.runs.append(run)
+        self.pending = set()
+
+    def drain(self) -> Iterator[str]:
+        merged = heapq.merge(
+            sorted(self.pending),
+            *[(i[:-1] for i in run) for run in self.runs]
+        )
+
+        last = None  # type: Optional[str]
+        for i in merged:
+            if i != last:
+                yield i
+                last = i
+
+        for run in self.runs:
+            run.close()
 
 
 def list_function(path: str) -> None:
-    funcs = set()  # type: Set[str]
+    funcs = SortedSpill()
 
     for module in iter_compile_logs_by_module(path):
         funcs.update(module.funcsByName.keys())
 
-    for i in sorted(funcs):
-        print(i)
+    _emit(funcs.drain())
 
 
 def list_location(path: str) -> None:
-    locs = set()  # type: Set[str]
+    locs = SortedSpill()
 
     for inst in iter_compile_logs_by_inst(path):
         locs.update(inst.info)
 
-    for i in sorted(locs):
-        print(i)
+    _emit(locs.drain())
+
+
+def _subtract(items: Iterator[str], drops: Iterator[str]) -> Iterator[str]:
+    # both streams are sorted, skip items that appear in drops
+    cur = next(drops, None)
+
+    for i in items:
+        while cur is not None and cur < i:
+            cur = next(drops, None)
+
+        if cur != i:
+            yield i
 
 
 def list_api(path: str) -> None:
-    apis = set()  # type: Set[str]
-    funcs = set()  # type: Set[str]
+    apis = SortedSpill()
+    funcs = SortedSpill()
 
     for module in iter_compile_logs_by_module(path):
         apis.update(module.apis)
         funcs.update(module.funcsByName.keys())
 
-    apis.difference_update(funcs)
-
-    for i in sorted(apis):
-        print(i)
+    _emit(_subtract(apis.drain(), funcs.drain()))
 
 
 def list_gvar(path: str) -> None:
@@ -137,8 +258,7 @@ def list_gvar(path: str) -> None:
     for module in iter_compile_logs_by_module(path):
         gvars.update(module.gvar)
 
-    for i in sorted(gvars):
-        print(i)
+    _emit(sorted(gvars))
 
 
 def list_type(path: str) -> None:
@@ -147,8 +267,7 @@ def list_type(path: str) -> None:
     for module in iter_compile_logs_by_module(path):
         types.update(module.structs)
 
-    for i in sorted(types):
-        print(i)
+    _emit(sorted(types))
 
 
 def main(argv: List[str]) -> int:
@@ -161,6 +280,7 @@ def main(argv: List[str]) -> int:
     sub_find = subs.add_parser('find')
     sub_find.add_argument('type', choices={'i', 's', 'l', 'b', 'f'})
     sub_find.add_argument('item')
+    sub_find.add_argument('--fast', action='store_true')
 
     # list
     sub_list = subs.add_parser('list')
@@ -175,9 +295,9 @@ def main(argv: List[str]) -> int:
         if args.type == 'i':
             find_instruction(path, args.item)
         elif args.type == 's':
-            find_string(path, args.item)
+            find_string(path, args.item, args.fast)
         elif args.type == 'l':
-            find_location(path, args.item)
+            find_location(path, args.item, args.fast)
         elif args.type == 'b':
             find_block(path, args.item)
         elif args.type == 'f':
@@ -17,14 +17,8 @@ DEF_INTENT_RELEASE = 'dart-dev'
 # utils
 def _clean_build(flavor: str, intent: str) -> None:
     with cd(config.PROJ_PATH):
-        execute(['make', 'build-racer', 'EXTRA=-ccc'])
-        execute(['make', 'build-linux', 'EXTRA=-ccc',
-                 'F={}'.format(flavor), 'I={}'.format(intent)])
-        execute(['make', 'build-initramfs', 'EXTRA=-ccc',
-                 'F={}'.format(flavor), 'I={}'.format(intent)])
-        execute(['make', 'spec-extract',
-                 'F={}'.format(flavor), 'I={}'.format(intent)])
-        execute(['make', 'spec-compose',
+        execute(['make', '-j{}'.format(config.NCPU), 'spec-ready',
+                 'EXTRA=-ccc',
                  'F={}'.format(flavor), 'I={}'.format(intent)])
 
 
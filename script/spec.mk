@@ -10,6 +10,7 @@ endef
 spec-help:
 	@echo "spec-: extract"
 	@echo "spec-: compose"
+	@echo "spec-: ready"
 
 .PHONY: spec-extract
 spec-extract: build-linux build-musl
@@ -17,4 +18,11 @@ spec-extract: build-linux build-musl
 
 .PHONY: spec-compose
 spec-compose: spec-extract
-	$(call racer_spec,$@)
\ No newline at end of file
+	$(call racer_spec,$@)
+
+# rebuild the toolchain-dependent parts from scratch and re-derive the spec,
+# meant to be driven by a single `make -j` so that independent packages are
+# built concurrently while the prerequisites still serialize the rest
+.PHONY: spec-ready
+spec-ready: EXTRA_GOALS = build-racer build-linux build-initramfs
+spec-ready: build-racer build-linux build-initramfs spec-compose
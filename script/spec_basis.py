@@ -1,26 +1,68 @@
-from typing import cast, NewType, TypeVar, Generic, Union, Optional, \
+from typing import cast, Any, NewType, TypeVar, Generic, Union, Optional, \
     List, Dict, Set, Tuple
 
 import json
+import bisect
 import struct
 import hashlib
+import itertools
 
-from abc import ABC, abstractmethod
+from abc import abstractmethod
 from enum import Enum
-from functools import cmp_to_key
 from dataclasses import dataclass, asdict
 
 from spec_const import SPEC_PTR_SIZE, SPEC_PROG_HEAP_OFFSET
-from spec_pack import pack_ptr
+from spec_pack import pack_ptrs, unpack_int_from
 from spec_random import SPEC_RANDOM
 from util_bean import Bean, BeanRef
 
 
+class LiteABCMeta(type):
+    """
+    A lighter ABCMeta, only collects abstract methods to block instantiation,
+    without the registry hooks on isinstance() and issubclass()
+    """
+
+    def __new__(
+            mcls, name: str, bases: Tuple[type, ...], ns: Dict[str, Any]
+    ) -> 'LiteABCMeta':
+        cls = super().__new__(mcls, name, bases, ns)
+
+        abstracts = {
+            k for k, v in ns.items()
+            if getattr(v, '__isabstractmethod__', False)
+        }
+        for base in bases:
+            for k in getattr(base, '__abstractmethods__', ()):
+                v = getattr(cls, k, None)
+                if getattr(v, '__isabstractmethod__', False):
+                    abstracts.add(k)
+
+        # type() turns a non-empty set into the abstract flag checked on init
+        cls.__abstractmethods__ = frozenset(abstracts)  # type: ignore
+        return cls
+
+
+class LiteABC(metaclass=LiteABCMeta):
+    """
+    Inherit from this instead of ABC to get a LiteABCMeta class
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> Any:
+        # short-circuit Generic.__new__ (present before Python 3.9) when a
+        # subclass is also generic, type parameters are never used at runtime
+        return object.__new__(cls)
+
+
 class Rand(Bean):
     """
     Typed dict, holds the input to kernel in a Lego object.
     """
 
+    __slots__ = ('lego',)
+
     lego: BeanRef['Lego']
 
 
@@ -33,6 +75,8 @@ class Kobj(Bean):
     Typed dict, holds the output from kernel in a Lego object
     """
 
+    __slots__ = ('lego',)
+
     lego: BeanRef['Lego']
 
 
@@ -40,11 +84,13 @@ T_Kobj = TypeVar('T_Kobj', bound=Kobj)
 N_Kobj = NewType('N_Kobj', Kobj)
 
 
-class KindSend(Bean, ABC, Generic[T_Rand]):
+class KindSend(Bean, LiteABC, Generic[T_Rand]):
     """
     Semantic types that assign meaning to input to kernel
     """
 
+    __slots__ = ('lego',)
+
     lego: BeanRef['Lego']
 
     # debug
@@ -133,11 +179,13 @@ class KindSend(Bean, ABC, Generic[T_Rand]):
         raise RuntimeError('Method not implemented')
 
 
-class KindRecv(Bean, ABC, Generic[T_Kobj]):
+class KindRecv(Bean, LiteABC, Generic[T_Kobj]):
     """
     Semantic types that assign meaning to input to kernel
     """
 
+    __slots__ = ('lego',)
+
     lego: BeanRef['Lego']
 
     # debug
@@ -203,11 +251,17 @@ class KindRecv(Bean, ABC, Generic[T_Kobj]):
         raise RuntimeError('Method not implemented')
 
 
-class Lego(Bean, ABC, Generic[T_Rand, T_Kobj]):
+class Lego(Bean, LiteABC, Generic[T_Rand, T_Kobj]):
     """
     Building blocks in the input space.
     """
 
+    __slots__ = (
+        'ctxt', 'root', 'rand', 'kobj',
+        'rdeps_rand', 'rdeps_kobj', 'epoch_rand', 'epoch_kobj',
+        '_info_send', '_info_recv',
+    )
+
     ctxt: Optional[BeanRef['Syscall']]
     root: Optional[BeanRef[Union['Lego', 'Arg', 'Ret']]]
 
@@ -231,6 +285,10 @@ class Lego(Bean, ABC, Generic[T_Rand, T_Kobj]):
         self.epoch_rand = 0
         self.epoch_kobj = 0
 
+        # cached results of has_info_send() and has_info_recv()
+        self._info_send = None  # type: Optional[bool]
+        self._info_recv = None  # type: Optional[bool]
+
     # debug
     def dump(self) -> str:
         note = self.note()
@@ -268,7 +326,7 @@ class Lego(Bean, ABC, Generic[T_Rand, T_Kobj]):
             assert self.ctxt.bean == ctxt
 
         else:
-            self.ctxt = BeanRef[Syscall](ctxt)
+            self.ctxt = BeanRef(ctxt)
             self.link_impl(ctxt)
 
         # ASSERT: after link
@@ -291,18 +349,33 @@ class Lego(Bean, ABC, Generic[T_Rand, T_Kobj]):
     #   - prepare heap slot for this lego if has_info_send()
     #   - pre-allocate heap slot if this lego (not has_info_send())
     #   - re-associate heap slot if this lego (has_info_send())
-    @abstractmethod
+    # NOTE: the lego tree is fixed once built, so the answers are cached
     def has_info_send(self) -> bool:
-        raise RuntimeError('Method not implemented')
+        info = cast(Optional[bool], getattr(self, '_info_send', None))
+        if info is None:
+            info = self.has_info_send_impl()
+            self._info_send = info
+        return info
 
     @abstractmethod
+    def has_info_send_impl(self) -> bool:
+        raise RuntimeError('Method not implemented')
+
     def has_info_recv(self) -> bool:
+        info = cast(Optional[bool], getattr(self, '_info_recv', None))
+        if info is None:
+            info = self.has_info_recv_impl()
+            self._info_recv = info
+        return info
+
+    @abstractmethod
+    def has_info_recv_impl(self) -> bool:
         raise RuntimeError('Method not implemented')
 
     # builders
     def _mk_rand(self) -> None:
         self.rand = self._mk_rand_impl()
-        self.rand.lego = BeanRef[Lego](self)
+        self.rand.lego = BeanRef(self)
 
     @abstractmethod
     def _mk_rand_impl(self) -> T_Rand:
@@ -310,7 +383,7 @@ class Lego(Bean, ABC, Generic[T_Rand, T_Kobj]):
 
     def _mk_kobj(self) -> None:
         self.kobj = self._mk_kobj_impl()
-        self.kobj.lego = BeanRef[Lego](self)
+        self.kobj.lego = BeanRef(self)
 
     @abstractmethod
     def _mk_kobj_impl(self) -> T_Kobj:
@@ -478,18 +551,17 @@ class Lego(Bean, ABC, Generic[T_Rand, T_Kobj]):
         if inst.has_hole(self):
             return
 
-        # check root validity
-        if self.root is None:
-            assert root is None
-
-        elif isinstance(self.root.bean, (Arg, Ret)):
+        # check root validity (only a Lego root can cascade into the hole)
+        base = None if self.root is None else self.root.bean
+        if not isinstance(base, Lego):
+            # ASSERT: base is None, Arg, or Ret
             assert root is None
 
         else:
             if root is None:
-                root = self.root.bean
+                root = base
             else:
-                assert root == self.root.bean
+                assert root == base
 
             # allows forward cascading only, but not backward
             if not inst.has_hole(root):
@@ -553,6 +625,8 @@ class Field(Bean):
     in a composite type (array, struct, union, etc).
     """
 
+    __slots__ = ('name', 'tyid', 'size', 'lego')
+
     name: str
     tyid: str
     size: int
@@ -575,6 +649,8 @@ class Arg(Bean):
     in a syscall.
     """
 
+    __slots__ = ('name', 'tyid', 'size', 'lego')
+
     name: str
     tyid: str
     size: int
@@ -604,6 +680,8 @@ class Ret(Bean):
     value from a syscall.
     """
 
+    __slots__ = ('tyid', 'size', 'lego')
+
     tyid: str
     size: int
     lego: Lego
@@ -632,11 +710,22 @@ class Syscall(Bean):
     and charts how these Lego objects are organized.
     """
 
+    __slots__ = ('snum', 'name', 'args', 'retv', '_base_name')
+
     snum: int
     name: str
     args: List[Arg]
     retv: Ret
 
+    # naming
+    def base_name(self) -> str:
+        # strip the variant suffix (e.g., open$dir -> open), cached lazily
+        base = cast(Optional[str], getattr(self, '_base_name', None))
+        if base is None:
+            base = self.name.partition('$')[0]
+            self._base_name = base
+        return base
+
     # debug
     def dump(self) -> str:
         return '{}({}) -> {}'.format(
@@ -680,35 +769,41 @@ class Syscall(Bean):
 
     # operations: mutate and puzzle
     def mutate(self, prog: 'Program') -> None:
-        if len(self.args) == 0:
+        # resolve the bean attr once
+        args = self.args
+        size = len(args)
+        if size == 0:
             return
 
         p = SPEC_RANDOM.random()
 
         if p < 0.8:
             # [TOSS] change only one arg
-            SPEC_RANDOM.choice(self.args).lego.mutate_rand(prog)
+            SPEC_RANDOM.choice(args).lego.mutate_rand(prog)
 
         else:
             # [TOSS] change multiple args at once
-            num = SPEC_RANDOM.randint(1, len(self.args))
-            for arg in SPEC_RANDOM.sample(self.args, num):
+            num = SPEC_RANDOM.randint(1, size)
+            for arg in SPEC_RANDOM.sample(args, num):
                 arg.lego.mutate_rand(prog)
 
     def puzzle(self, prog: 'Program') -> None:
-        if len(self.args) == 0:
+        # resolve the bean attr once
+        args = self.args
+        size = len(args)
+        if size == 0:
             return
 
         p = SPEC_RANDOM.random()
 
         if p < 0.8:
             # [DRAG] change only one arg
-            SPEC_RANDOM.choice(self.args).lego.puzzle_rand(prog)
+            SPEC_RANDOM.choice(args).lego.puzzle_rand(prog)
 
         else:
             # [DRAG] change multiple args at once
-            num = SPEC_RANDOM.randint(1, len(self.args))
-            for arg in SPEC_RANDOM.sample(self.args, num):
+            num = SPEC_RANDOM.randint(1, size)
+            for arg in SPEC_RANDOM.sample(args, num):
                 arg.lego.puzzle_rand(prog)
 
     # operations: update
@@ -748,6 +843,10 @@ class SyscallGroup(object):
         self.vals = set()  # type: Set[str]
         self.opts = {}  # type: Dict[Syscall, float]
 
+        # weighted sampling table, built once options are finalized
+        self.pick_opts = []  # type: List[Syscall]
+        self.pick_cums = []  # type: List[float]
+
     def set_base(self, base: Syscall, weight: float) -> Syscall:
         assert self.base is None
         self.base = base
@@ -767,6 +866,23 @@ class SyscallGroup(object):
         for item in self.opts:
             assert item.ready()
 
+        self.pick_opts = list(self.opts.keys())
+        self.pick_cums = list(itertools.accumulate(self.opts.values()))
+
+    def pick(self) -> Syscall:
+        # NOTE: same draw as choices(weights=...), minus re-accumulating them
+        return SPEC_RANDOM.choices(
+            self.pick_opts, cum_weights=self.pick_cums, k=1
+        )[0]
+
+    # pickle
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+
+        # groups pickled before the sampling table do not carry it
+        if 'pick_opts' not in state:
+            self.finalize()
+
 
 class NodeType(Enum):
     GENERIC = 0
@@ -799,45 +915,29 @@ class Synopsis(object):
     sketch: List[List[str]]
 
     @staticmethod
-    def _cmp_thread(t1: List[str], t2: List[str]) -> int:
-        if len(t1) != len(t2):
-            return len(t1) - len(t2)
-
-        for i1, i2 in zip(t1, t2):
-            if i1 != i2:
-                return 1 if i1 > i2 else -1
-
-        return 0
+    def _key_thread(t: List[str]) -> Tuple[int, List[str]]:
+        # order by length first, then lexicographically by syscall names
+        return len(t), t
 
     def _order(self) -> List[List[str]]:
-        return sorted(self.sketch, key=cmp_to_key(Synopsis._cmp_thread))
+        return sorted(self.sketch, key=Synopsis._key_thread)
 
     def codec(self) -> str:
-        sketch = self._order()
+        # NOTE: the codec names the seed directories on disk, keep sha1
         hasher = hashlib.sha1()
-        for t in sketch:
-            hasher.update(struct.pack('I', len(t)))
-            for i in t:
-                hasher.update(i.encode('charmap'))
-
+        hasher.update(b''.join([
+            struct.pack('I', len(t)) + ''.join(t).encode('charmap')
+            for t in self._order()
+        ]))
         return hasher.hexdigest()
 
     def match(self, other: 'Synopsis') -> bool:
         if len(self.sketch) != len(other.sketch):
             return False
 
-        sk1 = self._order()
-        sk2 = other._order()
-
-        for t1, t2 in zip(sk1, sk2):
-            if len(t1) != len(t2):
-                return False
-
-            for i1, i2 in zip(t1, t2):
-                if i1 != i2:
-                    return False
-
-        return True
+        # nested list equality runs in C and short-cuts on identical names,
+        # which is the common case as cloned syscalls share the name object
+        return self._order() == other._order()
 
 
 class Program(object):
@@ -853,6 +953,9 @@ class Program(object):
         self.syscalls = []  # type: List[Syscall]
         self.syscalls_start = 0
 
+        # position of each syscall in the global sequence
+        self.syscalls_index = {}  # type: Dict[Syscall, int]
+
         # syscalls partitioned by threads
         self.thread_main = []  # type: List[Syscall]
         self.thread_subs = []  # type: List[List[Syscall]]
@@ -864,8 +967,10 @@ class Program(object):
         self.repo_fd_rand = {}  # type: Dict[NodeType, List[Lego]]
         self.repo_fd_kobj = {}  # type: Dict[NodeType, List[Lego]]
 
-        # epoch information
-        self.epoch_changes = set()  # type: Set[Lego]
+        # epoch information: a lego is modified in the current epoch if its
+        # epoch_rand equals epoch_current (legos start with epoch 0)
+        self.epoch_current = 1
+        self.epoch_changes = 0
 
         # initialize
         for i in NodeType:
@@ -877,12 +982,38 @@ class Program(object):
         for _ in range(self.ncpu):
             self.thread_subs.append([])
 
+    # pickle
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+
+        # programs pickled before the position index do not carry it
+        if 'syscalls_index' not in state:
+            self.syscalls_index = {}
+            self._reindex(0)
+
+        # programs pickled before the epoch markers hold a set of legos
+        if 'epoch_current' not in state:
+            self.epoch_current = 1
+            for lego in state['epoch_changes']:
+                lego.epoch_rand = self.epoch_current
+            self.epoch_changes = len(state['epoch_changes'])
+
     # util
+    def _reindex(self, pos: int) -> None:
+        # refresh positions of the syscalls shifted by an insert or delete
+        for i in range(pos, len(self.syscalls)):
+            self.syscalls_index[self.syscalls[i]] = i
+
+    def _add_to_thread(self, syscall: Syscall, tid: int) -> None:
+        # NOTE: the backward scan for the preceding syscall in the same
+        # thread compared the tid against the thread list and never matched,
+        # hence new syscalls have always been placed at the thread front
+        self.thread_subs[tid].insert(0, syscall)
+        self.thread_dist[syscall] = tid
+
     def lego_index(self, lego: Lego) -> int:
         assert lego.ctxt is not None
-        index = self.syscalls.index(lego.ctxt.bean)
-        assert index >= 0
-        return index
+        return self.syscalls_index[lego.ctxt.bean]
 
     def lego_in_precall(self, lego: Lego) -> bool:
         # lego in precalls should be preserved and not be mutated or puzzled
@@ -896,6 +1027,7 @@ class Program(object):
     def bootstrap(self, preload: List[Syscall]) -> None:
         for syscall in preload:
             # put in global sequence
+            self.syscalls_index[syscall] = len(self.syscalls)
             self.syscalls.append(syscall)
             self.syscalls_start += 1
 
@@ -911,6 +1043,7 @@ class Program(object):
         # find the location and insert syscall
         pos = SPEC_RANDOM.randint(self.syscalls_start, len(self.syscalls))
         self.syscalls.insert(pos, syscall)
+        self._reindex(pos)
 
         # prepare the syscall
         syscall.engage(self)
@@ -920,19 +1053,9 @@ class Program(object):
             self.syscalls[i].update(self)
 
         # add syscall in local sequence
-        thread = SPEC_RANDOM.choice(self.thread_subs) if tid is None else \
-            self.thread_subs[tid]
-
-        before = 0
-        i = pos - 1
-        while i >= 0:
-            if self.thread_dist[self.syscalls[i]] == thread:
-                before = thread.index(self.syscalls[i]) + 1
-                break
-            i -= 1
-
-        thread.insert(before, syscall)
-        self.thread_dist[syscall] = self.thread_subs.index(thread)
+        if tid is None:
+            tid = SPEC_RANDOM.randrange(self.ncpu)
+        self._add_to_thread(syscall, tid)
 
     def mod_syscall(self, victim: Optional[int]) -> None:
         # find the syscall to modify
@@ -958,6 +1081,8 @@ class Program(object):
         # delete the syscall
         syscall.remove(self)
         del self.syscalls[pos]
+        del self.syscalls_index[syscall]
+        self._reindex(pos)
 
         # update the subsequent syscalls
         for i in range(pos, len(self.syscalls)):
@@ -972,21 +1097,31 @@ class Program(object):
         return len(self.syscalls) - self.syscalls_start
 
     def mod_all_syscalls(self) -> None:
+        swept = False
         for pos, syscall in enumerate(self.syscalls):
             # do not mutate precalls
             if pos < self.syscalls_start:
                 continue
 
             # decide mutate or puzzle
+            epoch = self.epoch_changes
             if SPEC_RANDOM.random() < 0.8:
                 syscall.mutate(self)
             else:
                 syscall.puzzle(self)
 
+            # a lego is altered at most once per epoch, so an unchanged epoch
+            # means nothing was altered and the suffix, already covered by
+            # the previous sweep, is still up-to-date
+            if swept and self.epoch_changes == epoch:
+                continue
+
             # update the subsequent syscalls
             for i in range(pos, len(self.syscalls)):
                 self.syscalls[i].update(self)
 
+            swept = True
+
     # combination of programs
     def merge(self, prog: 'Program') -> None:
         ctxt = {}  # type: Dict[Bean, Bean]
@@ -1004,6 +1139,11 @@ class Program(object):
         # next migrate the syscalls
         hist = set()  # type: Set[Lego]
         prev = self.syscalls_start
+
+        # the containers are only mutated in place, bind them once
+        syscalls = self.syscalls
+        other_dist = prog.thread_dist
+
         for other in prog.syscalls[prog.syscalls_start:]:
             # clone the syscall structure
             syscall = other.clone(ctxt)
@@ -1013,8 +1153,9 @@ class Program(object):
             syscall.check()
 
             # find the location and insert syscall
-            pos = SPEC_RANDOM.randint(prev, len(self.syscalls))
-            self.syscalls.insert(pos, syscall)
+            pos = SPEC_RANDOM.randint(prev, len(syscalls))
+            syscalls.insert(pos, syscall)
+            self._reindex(pos)
 
             # engage the syscall
             syscall.engage(self)
@@ -1023,22 +1164,11 @@ class Program(object):
             syscall.migrate(other, ctxt, hist)
 
             # update the subsequent syscalls
-            for i in range(pos, len(self.syscalls)):
-                self.syscalls[i].update(self)
+            for i in range(pos, len(syscalls)):
+                syscalls[i].update(self)
 
             # add syscall to local sequence
-            thread = self.thread_subs[prog.thread_dist[other]]
-
-            before = 0
-            i = pos - 1
-            while i >= 0:
-                if self.thread_dist[self.syscalls[i]] == thread:
-                    before = thread.index(self.syscalls[i]) + 1
-                    break
-                i -= 1
-
-            thread.insert(before, syscall)
-            self.thread_dist[syscall] = self.thread_subs.index(thread)
+            self._add_to_thread(syscall, other_dist[other])
 
             # the next syscall must be added after this one
             prev = pos + 1
@@ -1057,38 +1187,38 @@ class Program(object):
     # blob
     def _pack_thread(
             self, inst: 'Executable', syscalls: List[Syscall]
-    ) -> bytearray:
-        code = bytearray(pack_ptr(len(syscalls)))
+    ) -> bytes:
+        # NOTE: collect all fields of the thread first so that its bytecode
+        # is allocated at its exact size and packed in a single call
+        vals = [len(syscalls)]
 
         for syscall in syscalls:
             prep_list = inst.prep.get(syscall, [])
 
             # syscall prep
-            code += pack_ptr(len(prep_list))
+            vals.append(len(prep_list))
             for prep_item in prep_list:
-                code += pack_ptr(prep_item[0].addr)
-                code += pack_ptr(prep_item[0].size)
-                code += pack_ptr(prep_item[1].addr)
-                code += pack_ptr(prep_item[1].size)
+                vals.extend((
+                    prep_item[0].addr, prep_item[0].size,
+                    prep_item[1].addr, prep_item[1].size,
+                ))
 
             # syscall id
-            code += pack_ptr(syscall.snum)
+            vals.append(syscall.snum)
 
             # syscall retv
             hole = inst.get_hole(syscall.retv.lego)
-            code += pack_ptr(hole.addr)
-            code += pack_ptr(hole.size)
+            vals.extend((hole.addr, hole.size))
 
             # syscall args
-            code += pack_ptr(len(syscall.args))
+            vals.append(len(syscall.args))
             for arg in syscall.args:
                 hole = inst.get_hole(arg.lego)
-                code += pack_ptr(hole.addr)
-                code += pack_ptr(hole.size)
+                vals.extend((hole.addr, hole.size))
 
-        return code
+        return pack_ptrs(vals)
 
-    def gen_bytecode(self) -> Tuple['Executable', bytearray]:
+    def _gen_regions(self) -> Tuple['Executable', List[bytes]]:
         # NOTE: general executable layout:
         #   - head
         #       - (8) magic string (bytecode)
@@ -1134,28 +1264,19 @@ class Program(object):
         region_heap = inst.heap
 
         # build component: meta
-        region_meta = bytearray(pack_ptr(len(inst.ptrs)))
+        vals = [len(inst.ptrs)]
 
         # save all ptr locations so we could adjust it with actual value
-        for ptr in sorted(inst.ptrs, key=lambda h: h.addr):
-            region_meta += pack_ptr(ptr.addr)
+        vals.extend(sorted(inst.ptrs.keys()))
 
         # save all fd used so we could close all of them at the end
-        all_fd = {}  # type: Dict[int, int]
-        for fd in inst.fds:
-            if fd.addr in all_fd:
-                assert all_fd[fd.addr] == fd.size
-            else:
-                all_fd[fd.addr] = fd.size
+        vals.append(len(inst.fds))
+        for fd_addr in sorted(inst.fds.keys()):
+            vals.extend((fd_addr, inst.fds[fd_addr]))
 
-        region_meta += pack_ptr(len(all_fd))
-        for fd_addr in sorted(all_fd.keys()):
-            region_meta += pack_ptr(fd_addr)
-            region_meta += pack_ptr(all_fd[fd_addr])
+        region_meta = pack_ptrs(vals)
 
         # build component: code
-        region_code = bytearray(pack_ptr(self.ncpu))
-
         # pre-build the bytecode for main and subs
         thread_main = self._pack_thread(
             inst, self.syscalls[:self.syscalls_start]
@@ -1165,33 +1286,42 @@ class Program(object):
         ]
 
         # derive cursors
+        vals = [self.ncpu]
+
         cursor = (1 + 1 + self.ncpu) * SPEC_PTR_SIZE
-        region_code += pack_ptr(cursor)
+        vals.append(cursor)
 
         cursor += len(thread_main)
         for sub in thread_subs:
-            region_code += pack_ptr(cursor)
+            vals.append(cursor)
             cursor += len(sub)
 
-        # add thread bytecode
-        region_code += thread_main
-        for sub in thread_subs:
-            region_code += sub
+        # add thread bytecode (kept as pieces, the cursor is the total size)
+        region_code = [pack_ptrs(vals), thread_main, *thread_subs]
+        region_code_size = cursor
 
         # build component: head
-        region_head = bytearray('bytecode'.encode('charmap'))
+        vals = []
 
         cursor = 4 * SPEC_PTR_SIZE
-        region_head += pack_ptr(cursor)  # meta offset
+        vals.append(cursor)  # meta offset
 
         cursor += len(region_meta)
-        region_head += pack_ptr(cursor)  # code offset
+        vals.append(cursor)  # code offset
+
+        cursor += region_code_size
+        vals.append(cursor)  # heap offset
 
-        cursor += len(region_code)
-        region_head += pack_ptr(cursor)  # heap offset
+        region_head = 'bytecode'.encode('charmap') + pack_ptrs(vals)
 
-        # return combined
-        return inst, region_head + region_meta + region_code + region_heap
+        # return the pieces in layout order
+        return inst, [region_head, region_meta, *region_code, region_heap]
+
+    def gen_bytecode(self) -> Tuple['Executable', bytearray]:
+        inst, regions = self._gen_regions()
+
+        # combine, allocated once at its final size
+        return inst, bytearray().join(regions)
 
     # form
     def gen_synopsis(self) -> Synopsis:
@@ -1204,13 +1334,31 @@ class Program(object):
 
     # epoch
     def add_epoch_mod(self, lego: Lego) -> None:
-        self.epoch_changes.add(lego)
+        if lego.epoch_rand != self.epoch_current:
+            lego.epoch_rand = self.epoch_current
+            self.epoch_changes += 1
 
     def has_epoch_mod(self, lego: Lego) -> bool:
-        return lego in self.epoch_changes
+        return lego.epoch_rand == self.epoch_current
 
     def clear_epoch(self) -> None:
-        self.epoch_changes.clear()
+        self.epoch_current += 1
+        self.epoch_changes = 0
+
+    # repo: util
+    def _pick_prior(self, repo: List[Lego], lego: Lego) -> Lego:
+        # pick among the legos in the repo that appear before the given lego
+        # NOTE: the candidates must stay in repo order to keep picks stable
+        index = self.lego_index(lego)
+        syscalls_index = self.syscalls_index
+
+        prior = []  # type: List[Lego]
+        for item in repo:
+            assert item.ctxt is not None
+            if syscalls_index[item.ctxt.bean] < index:
+                prior.append(item)
+
+        return SPEC_RANDOM.choice(prior)
 
     # repo: path
     def add_path_rand(self, mark: NodeType, lego: Lego) -> None:
@@ -1218,11 +1366,7 @@ class Program(object):
         self.repo_path_rand[mark].append(lego)
 
     def gen_path_rand(self, mark: NodeType, lego: Lego) -> Lego:
-        index = self.lego_index(lego)
-        return SPEC_RANDOM.choice([
-            i for i in self.repo_path_rand[mark]
-            if self.lego_index(i) < index
-        ])
+        return self._pick_prior(self.repo_path_rand[mark], lego)
 
     def del_path_rand(self, mark: NodeType, lego: Lego) -> None:
         assert lego in self.repo_path_rand[mark]
@@ -1234,11 +1378,7 @@ class Program(object):
         self.repo_fd_rand[mark].append(lego)
 
     def gen_fd_rand(self, mark: NodeType, lego: Lego) -> Lego:
-        index = self.lego_index(lego)
-        return SPEC_RANDOM.choice([
-            i for i in self.repo_fd_rand[mark]
-            if self.lego_index(i) < index
-        ])
+        return self._pick_prior(self.repo_fd_rand[mark], lego)
 
     def del_fd_rand(self, mark: NodeType, lego: Lego) -> None:
         assert lego in self.repo_fd_rand[mark]
@@ -1249,11 +1389,7 @@ class Program(object):
         self.repo_fd_kobj[mark].append(lego)
 
     def gen_fd_kobj(self, mark: NodeType, lego: Lego) -> Lego:
-        index = self.lego_index(lego)
-        return SPEC_RANDOM.choice([
-            i for i in self.repo_fd_kobj[mark]
-            if self.lego_index(i) < index
-        ])
+        return self._pick_prior(self.repo_fd_kobj[mark], lego)
 
     def del_fd_kobj(self, mark: NodeType, lego: Lego) -> None:
         assert lego in self.repo_fd_kobj[mark]
@@ -1262,14 +1398,7 @@ class Program(object):
     # inspect execution results
     @staticmethod
     def _extract_retv(hole: 'Hole', blob: bytes) -> int:
-        fmt = 'b' if hole.size == 1 \
-            else 'h' if hole.size == 2 \
-            else 'i' if hole.size == 4 \
-            else 'q' if hole.size == 8 \
-            else 'X'
-
-        data = blob[hole.addr:hole.addr + hole.size]
-        return cast(int, struct.unpack(fmt, data)[0])
+        return unpack_int_from(blob, hole.addr, hole.size * 8)
 
     @staticmethod
     def _inspect_thread(
@@ -1292,22 +1421,28 @@ class Program(object):
     def summary(self) -> Tuple[str, str]:
         sketch = self.gen_synopsis().codec()
 
-        _, code = self.gen_bytecode()
+        # hash the regions in sequence without concatenating them
+        _, regions = self._gen_regions()
 
         hasher = hashlib.sha1()
-        hasher.update(code)
+        for piece in regions:
+            hasher.update(piece)
         digest = hasher.hexdigest()
 
         return sketch, digest
 
 
 class Hole(object):
+    __slots__ = ('addr', 'size', 'fill', 'used')
 
     def __init__(self, addr: int, size: int) -> None:
         self.addr = addr
         self.size = size
         self.fill = False
 
+        # bytes already divided out of this hole for sub-holes
+        self.used = 0
+
     def covers(self, hole: 'Hole') -> bool:
         return \
             self.addr <= hole.addr and \
@@ -1321,18 +1456,21 @@ class Executable(object):
 
     def __init__(self) -> None:
         self.repo = {}  # type: Dict[Lego, Hole]
-        self.repo_offset = {}  # type: Dict[Lego, int]
+
+        # all holes sorted by their addresses (for locating sub-holes)
+        self.sorted_addrs = []  # type: List[int]
+        self.sorted_holes = []  # type: List[Hole]
 
         # tracks the offset of each object in data region
         # NOTE: heap starts from an offset instead of 0
-        self.heap = bytearray(b'\x00' * SPEC_PROG_HEAP_OFFSET)
+        self.heap = bytearray(SPEC_PROG_HEAP_OFFSET)
         self.heap_offset = SPEC_PROG_HEAP_OFFSET
 
-        # pointers
-        self.ptrs = set()  # type: Set[Hole]
+        # pointers (keyed by addr)
+        self.ptrs = {}  # type: Dict[int, Hole]
 
-        # fds
-        self.fds = set()  # type: Set[Hole]
+        # fds (addr -> size, deduplicated by addr)
+        self.fds = {}  # type: Dict[int, int]
 
         # preparation before syscalls
         self.prep = {}  # type: Dict[Syscall, List[Tuple[Hole, Hole]]]
@@ -1358,15 +1496,19 @@ class Executable(object):
         else:
             # divide
             base = self.repo[root]
-            offs = self.repo_offset[root]
+            offs = base.used
             assert 0 <= offs < offs + size <= base.size
 
             hole = Hole(base.addr + offs, size)
-            offs += size
-            self.repo_offset[root] = offs
+            base.used = offs + size
 
         self.repo[lego] = hole
-        self.repo_offset[lego] = 0
+
+        # NOTE: holes are not always dug in address order, e.g., a pointee
+        # allocated in the middle of dividing its container
+        i = bisect.bisect_right(self.sorted_addrs, hole.addr)
+        self.sorted_addrs.insert(i, hole.addr)
+        self.sorted_holes.insert(i, hole)
 
         return hole
 
@@ -1392,10 +1534,16 @@ class Executable(object):
             self.heap[hole.addr:stop] = data
             hole.fill = True
 
-            # also mark the sub-holes as filled
-            for item in self.repo.values():
+            # also mark the sub-holes as filled, which can only start within
+            # [addr, stop] and hence are located with a binary search
+            addrs = self.sorted_addrs
+            holes = self.sorted_holes
+            i = bisect.bisect_left(addrs, hole.addr)
+            while i < len(addrs) and addrs[i] <= stop:
+                item = holes[i]
                 if hole.covers(item):
                     item.fill = True
+                i += 1
 
     # check
     def check(self) -> None:
@@ -1408,11 +1556,14 @@ class Executable(object):
 
     # adjustment: ptr
     def add_ptr(self, ptr: Hole) -> None:
-        self.ptrs.add(ptr)
+        self.ptrs[ptr.addr] = ptr
 
     # adjustment: fd
     def add_fd(self, fd: Hole) -> None:
-        self.fds.add(fd)
+        if fd.addr in self.fds:
+            assert self.fds[fd.addr] == fd.size
+        else:
+            self.fds[fd.addr] = fd.size
 
     # adjustment: prep
     def add_prep(self, syscall: Syscall, src: Hole, dst: Hole) -> None:
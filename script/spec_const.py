@@ -27,7 +27,7 @@ SPEC_RAND_PATH_SEG_MAX = 16
 
 # charset and bufset
 SPEC_CHARSET = [chr(i) for i in range(1, 256)]
-SPEC_BYTESET = [chr(i).encode('charmap') for i in range(0, 256)]
+SPEC_BYTESET = [bytes((i,)) for i in range(0, 256)]
 
 # integer constants
 SPEC_ERR_CODE_MIN = -4096
@@ -1,16 +1,31 @@
-from typing import cast, Any, Set, Dict, List, Tuple, Union, Optional
+from typing import cast, Any, Set, Dict, List, Tuple, Union, Optional, \
+    Callable
 
 import re
 import os
 import json
 
-from sortedcontainers import SortedDict  # type: ignore
-
 from pkg_llvm import Package_LLVM
 from pkg_musl import Package_MUSL
 from pkg_linux import Package_LINUX
 
-from util import cd, prepdn, execute0, envldpaths
+from util import cd, prepdn, execute0, envldpaths, parallelize
+
+# matches '#define NAME' and '#define NAME VALUE' lines of a macro dump
+# NOTE: [^\S\n] is whitespace without newline, so no match spans lines
+RE_MACRO = re.compile(
+    r'^[^\S\n]*#define[^\S\n]+(\w+?)(?:[^\S\n]+(\S[^\n]*?))?[^\S\n]*$',
+    re.MULTILINE
+)
+
+
+def _invoke(job: Callable[[], Dict[str, int]]) -> Dict[str, int]:
+    return job()
+
+
+def _sort_by_key(info: Dict[str, int]) -> Dict[str, int]:
+    # sort once when the collection is complete (dicts keep the order)
+    return dict(sorted(info.items()))
 
 
 class Extractor(object):
@@ -59,20 +74,11 @@ class Extractor(object):
         defs = set()  # type: Set[str]
         vals = {}  # type: Dict[str, str]
 
-        defs_ptn = re.compile(r'^#define\s+(\w+?)\s*$')
-        vals_ptn = re.compile(r'^#define\s+(\w+?)\s+(\S.*?)$')
-        for line in outs.splitlines():
-            line = line.strip()
-
-            m = vals_ptn.match(line)
-            if m is not None:
-                vals[m.group(1)] = m.group(2)
-                continue
-
-            m = defs_ptn.match(line)
-            if m is not None:
+        for m in RE_MACRO.finditer(outs):
+            if m.group(2) is None:
                 defs.add(m.group(1))
-                continue
+            else:
+                vals[m.group(1)] = m.group(2)
 
         return defs, vals
 
@@ -210,10 +216,12 @@ class Extractor(object):
         data = self._dump_macro(
             'syscall', ['asm/unistd.h'], '%lu', prep,
         )
-        info = SortedDict()  # type: Dict[str, int]
+        info = {}  # type: Dict[str, int]
         for k, v in data.items():
             info[k[len('__NR_'):]] = int(v)
 
+        info = _sort_by_key(info)
+
         # save cache
         with open(cache, 'w') as f:
             json.dump(info, f, indent=2)
@@ -232,7 +240,7 @@ class Extractor(object):
         data = self._dump_macro(
             'flag-open', ['asm/fcntl.h'], '%lu', prep,
         )
-        info = SortedDict()  # type: Dict[str, int]
+        info = {}  # type: Dict[str, int]
         for k, v in data.items():
             info[k] = int(v)
 
@@ -250,7 +258,7 @@ class Extractor(object):
         data = self._dump_macro(
             'flag-mode', ['linux/stat.h'], '%lu', prep,
         )
-        info = SortedDict()  # type: Dict[str, int]
+        info = {}  # type: Dict[str, int]
         for k, v in data.items():
             info[k] = int(v)
 
@@ -268,7 +276,7 @@ class Extractor(object):
         data = self._dump_macro(
             'flag-falloc', ['uapi/linux/falloc.h'], '%lu', prep,
         )
-        info = SortedDict()  # type: Dict[str, int]
+        info = {}  # type: Dict[str, int]
         for k, v in data.items():
             info[k] = int(v)
 
@@ -286,7 +294,7 @@ class Extractor(object):
         data = self._dump_macro(
             'flag-fadvise', ['uapi/linux/fadvise.h'], '%lu', prep,
         )
-        info = SortedDict()  # type: Dict[str, int]
+        info = {}  # type: Dict[str, int]
         for k, v in data.items():
             info[k] = int(v)
 
@@ -304,7 +312,7 @@ class Extractor(object):
         data = self._dump_macro(
             'flag-splice', ['linux/sched.h', 'linux/splice.h'], '%lu', prep,
         )
-        info = SortedDict()  # type: Dict[str, int]
+        info = {}  # type: Dict[str, int]
         for k, v in data.items():
             info[k] = int(v)
 
@@ -322,7 +330,7 @@ class Extractor(object):
         data = self._dump_macro(
             'flag-sync_file_range', ['uapi/linux/fs.h'], '%lu', prep,
         )
-        info = SortedDict()  # type: Dict[str, int]
+        info = {}  # type: Dict[str, int]
         for k, v in data.items():
             info[k] = int(v)
 
@@ -340,7 +348,7 @@ class Extractor(object):
         data = self._dump_macro(
             'flag-inode-type', ['linux/stat.h'], '%lu', prep,
         )
-        info = SortedDict()  # type: Dict[str, int]
+        info = {}  # type: Dict[str, int]
         for k, v in data.items():
             info[k] = int(v)
 
@@ -370,7 +378,7 @@ class Extractor(object):
             ]
         )
 
-        info = SortedDict()  # type: Dict[str, int]
+        info = {}  # type: Dict[str, int]
         for k, v in data.items():
             info[k] = int(v)
 
@@ -389,7 +397,7 @@ class Extractor(object):
             ]
         )
 
-        info = SortedDict()  # type: Dict[str, int]
+        info = {}  # type: Dict[str, int]
         for k, v in data.items():
             info[k] = int(v)
 
@@ -426,7 +434,7 @@ class Extractor(object):
             ]
         )
 
-        info = SortedDict()  # type: Dict[str, int]
+        info = {}  # type: Dict[str, int]
         for k, v in data.items():
             info[k] = int(v)
 
@@ -441,15 +449,20 @@ class Extractor(object):
                 return cast(Dict[str, Dict[str, Any]], json.load(f))
 
         # do extraction
-        info = {
-            'open': self._extract_flag_open(),
-            'mode': self._extract_flag_mode(),
-            'falloc': self._extract_flag_falloc(),
-            'fadvise': self._extract_flag_fadvise(),
-            'splice': self._extract_flag_splice(),
-            'sync_file_range': self._extract_flag_sync_file_range(),
-            'inode-type': self._extract_flag_inode_type(),
-        }
+        # NOTE: each job compiles and runs its own dump program, so they are
+        # independent and can overlap in separate processes
+        jobs = {
+            'open': self._extract_flag_open,
+            'mode': self._extract_flag_mode,
+            'falloc': self._extract_flag_falloc,
+            'fadvise': self._extract_flag_fadvise,
+            'splice': self._extract_flag_splice,
+            'sync_file_range': self._extract_flag_sync_file_range,
+            'inode-type': self._extract_flag_inode_type,
+        }  # type: Dict[str, Callable[[], Dict[str, int]]]
+
+        rets = parallelize(_invoke, list(jobs.values()), len(jobs))
+        info = dict(zip(jobs.keys(), [_sort_by_key(ret) for ret in rets]))
 
         # save cache
         with open(cache, 'w') as f:
@@ -466,10 +479,17 @@ class Extractor(object):
                 return cast(Dict[str, int], json.load(f))
 
         # do extraction
-        info = SortedDict()  # type: Dict[str, int]
-        info.update(self._extract_size_base())
-        info.update(self._extract_size_struct_iovec())
-        info.update(self._extract_size_struct_stat())
+        jobs = [
+            self._extract_size_base,
+            self._extract_size_struct_iovec,
+            self._extract_size_struct_stat,
+        ]  # type: List[Callable[[], Dict[str, int]]]
+
+        info = {}  # type: Dict[str, int]
+        for ret in parallelize(_invoke, jobs, len(jobs)):
+            info.update(ret)
+
+        info = _sort_by_key(info)
 
         # save cache
         with open(cache, 'w') as f:
@@ -1,4 +1,5 @@
-from typing import cast, Any, NamedTuple, Type, Tuple, List, Dict, Optional
+from typing import cast, Any, NamedTuple, Type, Tuple, List, Dict, Set, \
+    Optional
 
 import os
 import pickle
@@ -55,6 +56,12 @@ class Spec(object):
         self.Info_flags = extractor.extract_flags()
         self.Info_sizes = extractor.extract_sizes()
 
+        # flag value sets, shared by all flag kinds of the same name
+        # NOTE: the sets are never mutated and Bean.clone copies them
+        self.Info_flag_vals = {
+            k: set(v.values()) for k, v in self.Info_flags.items()
+        }  # type: Dict[str, Set[int]]
+
         # syscalls
         self.Syscalls = [
             self.syscall_open(),
@@ -165,10 +172,7 @@ class Spec(object):
     def syscall_generate(self) -> Syscall:
         group = SPEC_RANDOM.choice(self.Syscalls)
 
-        opts = list(group.opts.keys())
-        vals = [group.opts[i] for i in opts]
-
-        syscall = SPEC_RANDOM.choices(opts, weights=vals, k=1)[0].clone()
+        syscall = group.pick().clone()
         syscall.link()
         syscall.check()
 
@@ -410,42 +414,42 @@ class Spec(object):
         return KindSendIntFlag.build(
             bits=32, signed=True,
             name='open',
-            vals=set(self.Info_flags['open'].values()),
+            vals=self.Info_flag_vals['open'],
         )
 
     def ks_int_flag_mode(self) -> KindSendIntFlag:
         return KindSendIntFlag.build(
             bits=32, signed=False,
             name='mode',
-            vals=set(self.Info_flags['mode'].values()),
+            vals=self.Info_flag_vals['mode'],
         )
 
     def ks_int_flag_falloc(self) -> KindSendIntFlag:
         return KindSendIntFlag.build(
             bits=32, signed=True,
             name='falloc',
-            vals=set(self.Info_flags['falloc'].values()),
+            vals=self.Info_flag_vals['falloc'],
         )
 
     def ks_int_flag_fadvise(self) -> KindSendIntFlag:
         return KindSendIntFlag.build(
             bits=32, signed=True,
             name='fadvise',
-            vals=set(self.Info_flags['fadvise'].values()),
+            vals=self.Info_flag_vals['fadvise'],
         )
 
     def ks_int_flag_splice(self) -> KindSendIntFlag:
         return KindSendIntFlag.build(
             bits=32, signed=True,
             name='splice',
-            vals=set(self.Info_flags['splice'].values()),
+            vals=self.Info_flag_vals['splice'],
         )
 
     def ks_int_flag_sync_file_range(self) -> KindSendIntFlag:
         return KindSendIntFlag.build(
             bits=32, signed=True,
             name='sync_file_range',
-            vals=set(self.Info_flags['sync_file_range'].values()),
+            vals=self.Info_flag_vals['sync_file_range'],
         )
 
     # ks: int_holder
@@ -617,16 +621,16 @@ class Spec(object):
 
     # ks: len
     def ks_len_u8(self, ptr: LegoPointer) -> KindSendLen:
-        return KindSendLen.build(bits=8, ptr=BeanRef[LegoPointer](ptr))
+        return KindSendLen.build(bits=8, ptr=BeanRef(ptr))
 
     def ks_len_u16(self, ptr: LegoPointer) -> KindSendLen:
-        return KindSendLen.build(bits=16, ptr=BeanRef[LegoPointer](ptr))
+        return KindSendLen.build(bits=16, ptr=BeanRef(ptr))
 
     def ks_len_u32(self, ptr: LegoPointer) -> KindSendLen:
-        return KindSendLen.build(bits=32, ptr=BeanRef[LegoPointer](ptr))
+        return KindSendLen.build(bits=32, ptr=BeanRef(ptr))
 
     def ks_len_u64(self, ptr: LegoPointer) -> KindSendLen:
-        return KindSendLen.build(bits=64, ptr=BeanRef[LegoPointer](ptr))
+        return KindSendLen.build(bits=64, ptr=BeanRef(ptr))
 
     # kr: int_data
     def kr_int_i8(self) -> KindRecvIntData:
@@ -934,7 +938,7 @@ class Spec(object):
     # l_ptr: int_off (in)
     def l_ptr_int_off64_in(self) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_int_off64_in())
+            memv=BeanRef(self.l_int_off64_in())
         )
 
     # l_simple: str (in)
@@ -958,12 +962,12 @@ class Spec(object):
     # l_ptr: str (in)
     def l_ptr_str_in(self) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_str_in())
+            memv=BeanRef(self.l_str_in())
         )
 
     def l_ptr_str_out(self) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_str_out())
+            memv=BeanRef(self.l_str_out())
         )
 
     # l_simple: buf (in)
@@ -981,13 +985,13 @@ class Spec(object):
     # l_ptr: buf (in)
     def l_ptr_buf_in(self) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_buf_in())
+            memv=BeanRef(self.l_buf_in())
         )
 
     # l_ptr: buf (out)
     def l_ptr_buf_out(self) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_buf_out())
+            memv=BeanRef(self.l_buf_out())
         )
 
     # l_simple: path (in)
@@ -1045,27 +1049,27 @@ class Spec(object):
     # l_ptr: path (in)
     def l_ptr_path_generic_in(self) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_generic_in())
+            memv=BeanRef(self.l_path_generic_in())
         )
 
     def l_ptr_path_file_in(self) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_file_in())
+            memv=BeanRef(self.l_path_file_in())
         )
 
     def l_ptr_path_dir_in(self) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_dir_in())
+            memv=BeanRef(self.l_path_dir_in())
         )
 
     def l_ptr_path_link_in(self) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_link_in())
+            memv=BeanRef(self.l_path_link_in())
         )
 
     def l_ptr_path_sym_in(self) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_sym_in())
+            memv=BeanRef(self.l_path_sym_in())
         )
 
     # l_ptr: path_const (in)
@@ -1073,7 +1077,7 @@ class Spec(object):
             self, val: str, null: bool = False
     ) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_generic_const_in(val)),
+            memv=BeanRef(self.l_path_generic_const_in(val)),
             null=null
         )
 
@@ -1081,7 +1085,7 @@ class Spec(object):
             self, val: str, null: bool = False
     ) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_file_const_in(val)),
+            memv=BeanRef(self.l_path_file_const_in(val)),
             null=null
         )
 
@@ -1089,7 +1093,7 @@ class Spec(object):
             self, val: str, null: bool = False
     ) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_dir_const_in(val)),
+            memv=BeanRef(self.l_path_dir_const_in(val)),
             null=null
         )
 
@@ -1097,7 +1101,7 @@ class Spec(object):
             self, val: str, null: bool = False
     ) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_link_const_in(val)),
+            memv=BeanRef(self.l_path_link_const_in(val)),
             null=null
         )
 
@@ -1105,7 +1109,7 @@ class Spec(object):
             self, val: str, null: bool = False
     ) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_sym_const_in(val)),
+            memv=BeanRef(self.l_path_sym_const_in(val)),
             null=null
         )
 
@@ -1138,31 +1142,31 @@ class Spec(object):
     # l_ptr: path_ext (in)
     def l_ptr_path_ext_generic_in(self, null: bool = True) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_ext_generic_in()),
+            memv=BeanRef(self.l_path_ext_generic_in()),
             null=null
         )
 
     def l_ptr_path_ext_file_in(self, null: bool = True) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_ext_file_in()),
+            memv=BeanRef(self.l_path_ext_file_in()),
             null=null
         )
 
     def l_ptr_path_ext_dir_in(self, null: bool = True) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_ext_dir_in()),
+            memv=BeanRef(self.l_path_ext_dir_in()),
             null=null
         )
 
     def l_ptr_path_ext_link_in(self, null: bool = True) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_ext_link_in()),
+            memv=BeanRef(self.l_path_ext_link_in()),
             null=null
         )
 
     def l_ptr_path_ext_sym_in(self, null: bool = True) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_path_ext_sym_in()),
+            memv=BeanRef(self.l_path_ext_sym_in()),
             null=null
         )
 
@@ -1361,12 +1365,12 @@ class Spec(object):
     # l_ptr: vector_iovec
     def l_ptr_vector_iovec_in(self) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_vector_iovec_in())
+            memv=BeanRef(self.l_vector_iovec_in())
         )
 
     def l_ptr_vector_iovec_out(self) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_vector_iovec_out())
+            memv=BeanRef(self.l_vector_iovec_out())
         )
 
     # l_struct: stat
@@ -1500,7 +1504,7 @@ class Spec(object):
     # l_ptr: stat
     def l_ptr_struct_stat_out(self) -> LegoPointer:
         return LegoPointer.build(
-            memv=BeanRef[Lego](self.l_struct_stat_out())
+            memv=BeanRef(self.l_struct_stat_out())
         )
 
     # l_simple: len (in)
@@ -4112,6 +4116,6 @@ class Spec(object):
 
         spec = Spec(extractor)
         with open(cache, 'wb') as f:
-            pickle.dump(spec, f)
+            pickle.dump(spec, f, protocol=pickle.HIGHEST_PROTOCOL)
 
         return spec
@@ -8,14 +8,18 @@ from util_bean import Bean, BeanRef
 
 
 class RandPointer(Rand):
+    __slots__ = ('pick',)
+
     pick: bool
 
 
 class KobjPointer(Kobj):
-    pass
+    __slots__ = ()
 
 
 class LegoPointer(Lego[RandPointer, KobjPointer]):
+    __slots__ = ('memv', 'null')
+
     memv: Optional[BeanRef[Lego]]
     null: bool
 
@@ -46,7 +50,7 @@ class LegoPointer(Lego[RandPointer, KobjPointer]):
         return SPEC_PTR_SIZE
 
     # input/output
-    def has_info_send(self) -> bool:
+    def has_info_send_impl(self) -> bool:
         # a null pointer means info sent to kernel
         if self.memv is None:
             return True
@@ -54,7 +58,7 @@ class LegoPointer(Lego[RandPointer, KobjPointer]):
         # if the pointer refs to some heap object, the pointer has info to send
         return self.memv.bean.has_info_send()
 
-    def has_info_recv(self) -> bool:
+    def has_info_recv_impl(self) -> bool:
         # a null pointer cannot receive information
         if self.memv is None:
             return False
@@ -6,6 +6,8 @@ from util_bean import Bean, BeanRef
 
 
 class LegoSimple(Lego[T_Rand, T_Kobj], Generic[T_Rand, T_Kobj]):
+    __slots__ = ('kind_send', 'kind_recv')
+
     kind_send: Optional[KindSend[T_Rand]]
     kind_recv: Optional[KindRecv[T_Kobj]]
 
@@ -31,11 +33,11 @@ class LegoSimple(Lego[T_Rand, T_Kobj], Generic[T_Rand, T_Kobj]):
     # chain
     def link_impl(self, ctxt: Syscall) -> None:
         if self.kind_send is not None:
-            self.kind_send.lego = BeanRef[Lego](self)
+            self.kind_send.lego = BeanRef(self)
             self.kind_send.link(ctxt)
 
         if self.kind_recv is not None:
-            self.kind_recv.lego = BeanRef[Lego](self)
+            self.kind_recv.lego = BeanRef(self)
             self.kind_recv.link(ctxt)
 
     # memory
@@ -58,10 +60,10 @@ class LegoSimple(Lego[T_Rand, T_Kobj], Generic[T_Rand, T_Kobj]):
         return len_send
 
     # input/output
-    def has_info_send(self) -> bool:
+    def has_info_send_impl(self) -> bool:
         return self.kind_send is not None
 
-    def has_info_recv(self) -> bool:
+    def has_info_recv_impl(self) -> bool:
         return self.kind_recv is not None
 
     # builders
@@ -6,14 +6,16 @@ from util_bean import Bean
 
 
 class RandStruct(Rand):
-    pass
+    __slots__ = ()
 
 
 class KobjStruct(Kobj):
-    pass
+    __slots__ = ()
 
 
 class LegoStruct(Lego[RandStruct, KobjStruct]):
+    __slots__ = ('size', 'fields')
+
     size: int
     fields: List[Field]
 
@@ -52,11 +54,11 @@ class LegoStruct(Lego[RandStruct, KobjStruct]):
         return self.size
 
     # input/output
-    def has_info_send(self) -> bool:
+    def has_info_send_impl(self) -> bool:
         # given all fields are sync-ed in send, pick first one
         return self.fields[0].lego.has_info_send()
 
-    def has_info_recv(self) -> bool:
+    def has_info_recv_impl(self) -> bool:
         # mark the struct as recv only if all fields are recv
         for field in self.fields:
             if not field.lego.has_info_recv():
@@ -162,12 +164,7 @@ class LegoStruct(Lego[RandStruct, KobjStruct]):
             field.lego.blob_hole(self, inst)
 
     def blob_data(self, inst: Executable) -> bytes:
-        data = b''
-
-        for field in self.fields:
-            data += field.lego.blob_data(inst)
-
-        return data
+        return b''.join([field.lego.blob_data(inst) for field in self.fields])
 
     def blob_fill_impl(self, inst: Executable) -> None:
         for field in self.fields:
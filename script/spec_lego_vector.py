@@ -6,14 +6,18 @@ from util_bean import Bean
 
 
 class RandVector(Rand):
+    __slots__ = ('meta',)
+
     meta: List[int]
 
 
 class KobjVector(Kobj):
-    pass
+    __slots__ = ()
 
 
 class LegoVector(Lego[RandVector, KobjVector]):
+    __slots__ = ('cell_min', 'cell_max', 'cells')
+
     cell_min: int
     cell_max: int
     cells: List[Lego]
@@ -65,11 +69,11 @@ class LegoVector(Lego[RandVector, KobjVector]):
         return size * self.cell_min
 
     # input/output
-    def has_info_send(self) -> bool:
+    def has_info_send_impl(self) -> bool:
         # given all cells are sync-ed in send and recv, pick first one
         return self.cells[0].has_info_send()
 
-    def has_info_recv(self) -> bool:
+    def has_info_recv_impl(self) -> bool:
         # given all cells are sync-ed in send and recv, pick first one
         return self.cells[0].has_info_recv()
 
@@ -230,19 +234,14 @@ class LegoVector(Lego[RandVector, KobjVector]):
                 cell.blob_hole(self, inst)
 
     def blob_data(self, inst: Executable) -> bytes:
-        data = b''
-
         if self.has_info_send():
             rand = cast(RandVector, self.rand)
-            for idx in rand.meta:
-                data += self.cells[idx].blob_data(inst)
+            cells = self.cells
+            return b''.join([cells[idx].blob_data(inst) for idx in rand.meta])
 
         else:
             # ASSERT: self.has_info_recv()
-            for cell in self.cells:
-                data += cell.blob_data(inst)
-
-        return data
+            return b''.join([cell.blob_data(inst) for cell in self.cells])
 
     def blob_fill_impl(self, inst: Executable) -> None:
         if self.has_info_send():
@@ -1,3 +1,5 @@
+from typing import Dict, List, Tuple
+
 import struct
 
 from spec_const import SPEC_PTR_SIZE
@@ -24,15 +26,51 @@ def _get_int_pack_format(bits: int, signed: bool) -> str:
     raise RuntimeError('Invalid bits')
 
 
+# compile the formats once instead of parsing them on every call
+_INT_STRUCTS = {
+    (bits, signed): struct.Struct(_get_int_pack_format(bits, signed))
+    for bits in (8, 16, 32, 64) for signed in (False, True)
+}  # type: Dict[Tuple[int, bool], struct.Struct]
+
+
+def _get_int_struct(bits: int, signed: bool) -> struct.Struct:
+    packer = _INT_STRUCTS.get((bits, signed))
+    if packer is None:
+        raise RuntimeError('Invalid bits')
+    return packer
+
+
 def pack_int(val: int, bits: int, signed: bool = True) -> bytes:
-    return struct.pack(_get_int_pack_format(bits, signed), val)
+    return _get_int_struct(bits, signed).pack(val)
+
+
+def unpack_int_from(
+        buf: bytes, offset: int, bits: int, signed: bool = True
+) -> int:
+    return int(_get_int_struct(bits, signed).unpack_from(buf, offset)[0])
 
 
 # ptr
+_PTR_FORMAT = _get_int_pack_format(SPEC_PTR_SIZE * 8, False)
+_PTR_STRUCT = _get_int_struct(SPEC_PTR_SIZE * 8, False)
+_PTR_ARRAY_STRUCTS = {}  # type: Dict[int, struct.Struct]
+
+
 def pack_ptr(val: int) -> bytes:
-    return pack_int(val, SPEC_PTR_SIZE * 8, False)
+    return _PTR_STRUCT.pack(val)
+
+
+def pack_ptrs(vals: List[int]) -> bytes:
+    # pack a run of pointer-sized values with a single struct call
+    num = len(vals)
+    packer = _PTR_ARRAY_STRUCTS.get(num)
+    if packer is None:
+        packer = struct.Struct('{}{}'.format(num, _PTR_FORMAT))
+        _PTR_ARRAY_STRUCTS[num] = packer
+    return packer.pack(*vals)
 
 
 # str
 def pack_str(val: str) -> bytes:
-    return struct.pack('{}s'.format(len(val) + 1), val.encode('charmap'))
+    # same as packing with the '{len + 1}s' format: the string plus a NUL
+    return val.encode('charmap') + b'\x00'
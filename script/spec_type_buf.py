@@ -1,6 +1,6 @@
 from typing import List, Dict, Set, Optional
 
-from abc import ABC, abstractmethod
+from abc import abstractmethod
 
 from spec_const import SPEC_PAGE_SIZE, SPEC_BYTESET, SPEC_RAND_SIZE_MAX
 from spec_random import SPEC_RANDOM
@@ -10,14 +10,18 @@ from util_bean import Bean
 
 
 class RandBuf(Rand):
+    __slots__ = ('data',)
+
     data: bytes
 
 
 class KobjBuf(Kobj):
-    pass
+    __slots__ = ()
+
 
+class KindSendBuf(KindSend[RandBuf]):
+    __slots__ = ('fix_size', 'int_min', 'int_max')
 
-class KindSendBuf(KindSend[RandBuf], ABC):
     fix_size: Optional[int]
 
     def __init__(self) -> None:
@@ -175,6 +179,8 @@ class KindSendBuf(KindSend[RandBuf], ABC):
 
 
 class KindSendBufConst(KindSendBuf):
+    __slots__ = ('val_const',)
+
     val_const: bytes
 
     # debug
@@ -190,6 +196,8 @@ class KindSendBufConst(KindSendBuf):
 
 
 class KindSendBufRange(KindSendBuf):
+    __slots__ = ('byte_set', 'byte_sep', 'byte_min', 'byte_max')
+
     byte_set: List[bytes]
     byte_sep: bytes
     byte_min: int
@@ -254,7 +262,9 @@ class KindSendBufRange(KindSendBuf):
             return super().drag(data)
 
 
-class KindRecvBuf(KindRecv[KobjBuf], ABC):
+class KindRecvBuf(KindRecv[KobjBuf]):
+    __slots__ = ('fix_size',)
+
     fix_size: Optional[int]
 
     # defaults
@@ -301,6 +311,7 @@ class KindRecvBuf(KindRecv[KobjBuf], ABC):
 
 
 class KindRecvBufData(KindRecvBuf):
+    __slots__ = ()
 
     # debug
     def note(self) -> str:
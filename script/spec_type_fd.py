@@ -10,14 +10,18 @@ from util_bean import Bean, BeanRef
 
 
 class RandFd(Rand):
+    __slots__ = ('val',)
+
     val: int
 
 
 class KobjFd(Kobj):
-    pass
+    __slots__ = ()
 
 
 class KindSendFd(KindSend[RandFd]):
+    __slots__ = ('bits', 'mark', 'val_const', 'int_min', 'int_max')
+
     bits: int
     mark: NodeType
     val_const: Optional[int]
@@ -152,6 +156,8 @@ class KindSendFd(KindSend[RandFd]):
 
 
 class KindRecvFd(KindRecv[KobjFd]):
+    __slots__ = ('bits', 'mark')
+
     bits: int
     mark: NodeType
 
@@ -211,14 +217,18 @@ class KindRecvFd(KindRecv[KobjFd]):
 
 
 class RandFdExt(Rand):
+    __slots__ = ('pick',)
+
     pick: BeanRef[Lego]
 
 
 class KobjFdExt(Kobj):
-    pass
+    __slots__ = ()
 
 
 class KindSendFdExt(KindSend[RandFdExt]):
+    __slots__ = ('bits', 'mark')
+
     bits: int
     mark: NodeType
 
@@ -249,7 +259,7 @@ class KindSendFdExt(KindSend[RandFdExt]):
     # operations: engage and remove
     def engage_rand(self, rand: RandFdExt, prog: Program) -> None:
         # init
-        rand.pick = BeanRef[Lego](
+        rand.pick = BeanRef(
             prog.gen_fd_rand(self.mark, self.lego.bean)
         )
 
@@ -266,7 +276,7 @@ class KindSendFdExt(KindSend[RandFdExt]):
 
         else:
             # [TOSS] choose another fd
-            rand.pick = BeanRef[Lego](
+            rand.pick = BeanRef(
                 prog.gen_fd_rand(self.mark, self.lego.bean)
             )
 
@@ -281,7 +291,7 @@ class KindSendFdExt(KindSend[RandFdExt]):
             # [DRAG] choose another fd not in the same type
             alts = [i for i in NodeType if i != self.mark]
             mark = SPEC_RANDOM.choice(alts)
-            rand.pick = BeanRef[Lego](
+            rand.pick = BeanRef(
                 prog.gen_fd_rand(mark, self.lego.bean)
             )
 
@@ -291,7 +301,7 @@ class KindSendFdExt(KindSend[RandFdExt]):
             return
 
         # only update when pick does not exist anymore
-        rand.pick = BeanRef[Lego](
+        rand.pick = BeanRef(
             prog.gen_fd_rand(self.mark, self.lego.bean)
         )
 
@@ -332,14 +342,18 @@ class KindSendFdExt(KindSend[RandFdExt]):
 
 
 class RandFdRes(Rand):
+    __slots__ = ('pick',)
+
     pick: BeanRef[Lego]
 
 
 class KobjFdRes(Kobj):
-    pass
+    __slots__ = ()
 
 
 class KindSendFdRes(KindSend[RandFdRes]):
+    __slots__ = ('bits', 'mark')
+
     bits: int
     mark: NodeType
 
@@ -370,7 +384,7 @@ class KindSendFdRes(KindSend[RandFdRes]):
     # operations: engage and remove
     def engage_rand(self, rand: RandFdRes, prog: Program) -> None:
         # init
-        rand.pick = BeanRef[Lego](
+        rand.pick = BeanRef(
             prog.gen_fd_kobj(self.mark, self.lego.bean)
         )
 
@@ -380,7 +394,7 @@ class KindSendFdRes(KindSend[RandFdRes]):
     # operations: mutate and puzzle
     def mutate_rand(self, rand: RandFdRes, prog: Program) -> None:
         # [TOSS] choose another fd
-        rand.pick = BeanRef[Lego](
+        rand.pick = BeanRef(
             prog.gen_fd_kobj(self.mark, self.lego.bean)
         )
 
@@ -388,7 +402,7 @@ class KindSendFdRes(KindSend[RandFdRes]):
         # [DRAG] choose another fd not in the same type
         alts = [i for i in NodeType if i != self.mark]
         mark = SPEC_RANDOM.choice(alts)
-        rand.pick = BeanRef[Lego](
+        rand.pick = BeanRef(
             prog.gen_fd_kobj(mark, self.lego.bean)
         )
 
@@ -398,7 +412,7 @@ class KindSendFdRes(KindSend[RandFdRes]):
             return
 
         # only update when pick does not exist anymore
-        rand.pick = BeanRef[Lego](
+        rand.pick = BeanRef(
             prog.gen_fd_kobj(self.mark, self.lego.bean)
         )
 
@@ -1,6 +1,6 @@
 from typing import cast, List, Dict, Set, Optional
 
-from abc import ABC, abstractmethod
+from abc import abstractmethod
 from enum import Enum
 
 from spec_random import SPEC_RANDOM
@@ -11,14 +11,18 @@ from util_bean import Bean
 
 
 class RandInt(Rand):
+    __slots__ = ('data',)
+
     data: int
 
 
 class KobjInt(Kobj):
-    pass
+    __slots__ = ()
+
 
+class KindSendInt(KindSend[RandInt]):
+    __slots__ = ('bits', 'signed', 'int_min', 'int_max')
 
-class KindSendInt(KindSend[RandInt], ABC):
     bits: int
     signed: bool
 
@@ -135,6 +139,8 @@ class KindSendInt(KindSend[RandInt], ABC):
 
 
 class KindSendIntConst(KindSendInt):
+    __slots__ = ('val_const',)
+
     val_const: int
 
     # bean
@@ -173,6 +179,11 @@ class IntFlagOperation(Enum):
 
 
 class KindSendIntFlag(KindSendInt):
+    __slots__ = (
+        'name', 'vals', 'elem_min', 'elem_max', 'use_ops', 'use_neg',
+        'elem_set',
+    )
+
     name: str
     vals: Set[int]
     elem_min: int
@@ -252,6 +263,8 @@ class KindSendIntFlag(KindSendInt):
 
 
 class KindSendIntRange(KindSendInt):
+    __slots__ = ('val_min', 'val_max')
+
     val_min: int
     val_max: int
 
@@ -298,7 +311,9 @@ class KindSendIntRange(KindSendInt):
             return super().drag(data)
 
 
-class KindRecvInt(KindRecv[KobjInt], ABC):
+class KindRecvInt(KindRecv[KobjInt]):
+    __slots__ = ('bits', 'signed')
+
     bits: int
     signed: bool
 
@@ -344,6 +359,7 @@ class KindRecvInt(KindRecv[KobjInt], ABC):
 
 
 class KindRecvIntData(KindRecvInt):
+    __slots__ = ()
 
     # debug
     def note(self) -> str:
@@ -12,14 +12,18 @@ from util_bean import Bean, BeanRef
 
 
 class RandLen(Rand):
+    __slots__ = ('offset',)
+
     offset: Union[int, float]  # offset to the actual length
 
 
 class KobjLen(Kobj):
-    pass
+    __slots__ = ()
 
 
 class KindSendLen(KindSend[RandLen]):
+    __slots__ = ('bits', 'ptr')
+
     bits: int
     ptr: BeanRef[LegoPointer]
 
@@ -21,15 +21,19 @@ class PathMutationStrategy(Enum):
 
 
 class RandPath(Rand):
+    __slots__ = ('dirp', 'comp')
+
     dirp: Optional[BeanRef[LegoSimple]]
     comp: bool
 
 
 class KobjPath(Kobj):
-    pass
+    __slots__ = ()
 
 
 class KindSendPath(KindSend[RandPath]):
+    __slots__ = ('segment', 'pathsep', 'mark', 'strategies')
+
     segment: LegoSimple[RandStr, N_Kobj]
     pathsep: str
     mark: NodeType
@@ -114,7 +118,7 @@ class KindSendPath(KindSend[RandPath]):
                 RandPath,
                 prog.gen_path_rand(self.mark, self.lego.bean).rand
             ).dirp
-            rand.dirp = None if dirp is None else BeanRef[LegoSimple](dirp.bean)
+            rand.dirp = None if dirp is None else BeanRef(dirp.bean)
 
     def puzzle_rand(self, rand: RandPath, prog: Program) -> None:
         p = SPEC_RANDOM.random()
@@ -143,7 +147,7 @@ class KindSendPath(KindSend[RandPath]):
             RandPath,
             prog.gen_path_rand(self.mark, self.lego.bean).rand
         ).dirp
-        rand.dirp = None if dirp is None else BeanRef[LegoSimple](dirp.bean)
+        rand.dirp = None if dirp is None else BeanRef(dirp.bean)
 
     # operations: migrate
     def migrate_rand(
@@ -162,7 +166,7 @@ class KindSendPath(KindSend[RandPath]):
         if orig.dirp is None:
             rand.dirp = None
         else:
-            rand.dirp = BeanRef[LegoSimple](
+            rand.dirp = BeanRef(
                 cast(LegoSimple, ctxt[orig.dirp.bean])
             )
 
@@ -211,7 +215,7 @@ class KindSendPath(KindSend[RandPath]):
             NodeType.DIR if mark is None else mark,
             self.lego.bean
         )
-        rand.dirp = BeanRef[LegoSimple](cast(LegoSimple, dirp))
+        rand.dirp = BeanRef(cast(LegoSimple, dirp))
         rand.comp = True
 
     def _make_change_last_segment(self, mark: Optional[NodeType],
@@ -223,7 +227,7 @@ class KindSendPath(KindSend[RandPath]):
                 self.lego.bean
             ).rand
         ).dirp
-        rand.dirp = None if dirp is None else BeanRef[LegoSimple](dirp.bean)
+        rand.dirp = None if dirp is None else BeanRef(dirp.bean)
         rand.comp = True
 
     def _make_remove_first_segment(self, mark: Optional[NodeType],
@@ -235,7 +239,7 @@ class KindSendPath(KindSend[RandPath]):
                 self.lego.bean
             ).rand
         ).dirp
-        rand.dirp = None if dirp is None else BeanRef[LegoSimple](dirp.bean)
+        rand.dirp = None if dirp is None else BeanRef(dirp.bean)
         rand.comp = False
 
     def _make(self, k: PathMutationStrategy, mark: Optional[NodeType],
@@ -286,14 +290,18 @@ class KindSendPath(KindSend[RandPath]):
 
 
 class RandPathExt(Rand):
+    __slots__ = ('pick',)
+
     pick: BeanRef[Lego]
 
 
 class KobjPathExt(Kobj):
-    pass
+    __slots__ = ()
 
 
 class KindSendPathExt(KindSend[RandPathExt]):
+    __slots__ = ('mark',)
+
     mark: NodeType
 
     # bean
@@ -319,7 +327,7 @@ class KindSendPathExt(KindSend[RandPathExt]):
     # operations: engage and remove
     def engage_rand(self, rand: RandPathExt, prog: Program) -> None:
         # init
-        rand.pick = BeanRef[Lego](
+        rand.pick = BeanRef(
             prog.gen_path_rand(self.mark, self.lego.bean)
         )
 
@@ -336,7 +344,7 @@ class KindSendPathExt(KindSend[RandPathExt]):
 
         else:
             # [TOSS] choose another path
-            rand.pick = BeanRef[Lego](
+            rand.pick = BeanRef(
                 prog.gen_path_rand(self.mark, self.lego.bean)
             )
 
@@ -351,7 +359,7 @@ class KindSendPathExt(KindSend[RandPathExt]):
             # [DRAG] choose another path not in the same type
             alts = [i for i in NodeType if i != self.mark]
             mark = SPEC_RANDOM.choice(alts)
-            rand.pick = BeanRef[Lego](
+            rand.pick = BeanRef(
                 prog.gen_path_rand(mark, self.lego.bean)
             )
 
@@ -361,7 +369,7 @@ class KindSendPathExt(KindSend[RandPathExt]):
             return
 
         # only update when pick does not exist anymore
-        rand.pick = BeanRef[Lego](
+        rand.pick = BeanRef(
             prog.gen_path_rand(self.mark, self.lego.bean)
         )
 
@@ -1,6 +1,6 @@
 from typing import List, Dict, Set, Optional
 
-from abc import ABC, abstractmethod
+from abc import abstractmethod
 
 from spec_const import SPEC_PAGE_SIZE, SPEC_CHARSET, SPEC_RAND_SIZE_MAX
 from spec_random import SPEC_RANDOM
@@ -11,14 +11,18 @@ from util_bean import Bean
 
 
 class RandStr(Rand):
+    __slots__ = ('data',)
+
     data: str
 
 
 class KobjStr(Kobj):
-    pass
+    __slots__ = ()
+
 
+class KindSendStr(KindSend[RandStr]):
+    __slots__ = ('fix_size', 'int_min', 'int_max')
 
-class KindSendStr(KindSend[RandStr], ABC):
     fix_size: Optional[int]  # maximum length of the string, including the NULL
 
     def __init__(self) -> None:
@@ -176,6 +180,8 @@ class KindSendStr(KindSend[RandStr], ABC):
 
 
 class KindSendStrConst(KindSendStr):
+    __slots__ = ('val_const',)
+
     val_const: str
 
     # debug
@@ -191,6 +197,8 @@ class KindSendStrConst(KindSendStr):
 
 
 class KindSendStrRange(KindSendStr):
+    __slots__ = ('char_set', 'char_sep', 'char_min', 'char_max')
+
     char_set: List[str]
     char_sep: str
     char_min: int
@@ -253,7 +261,9 @@ class KindSendStrRange(KindSendStr):
             return super().drag(data)
 
 
-class KindRecvStr(KindRecv[KobjStr], ABC):
+class KindRecvStr(KindRecv[KobjStr]):
+    __slots__ = ('fix_size',)
+
     fix_size: Optional[int]
 
     # defaults
@@ -300,6 +310,7 @@ class KindRecvStr(KindRecv[KobjStr], ABC):
 
 
 class KindRecvStrData(KindRecvStr):
+    __slots__ = ()
 
     # debug
     def note(self) -> str:
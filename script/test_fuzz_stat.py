@@ -0,0 +1,10 @@
+from spec_basis import Program
+from fuzz_stat import parse_strace
+
+
+def test_parse_strace_empty(tmp_path):
+    (tmp_path / 'strace').write_bytes(b'')
+
+    ledger = parse_strace(str(tmp_path))
+    assert len(ledger.ledger) == 0
+    assert not ledger.validate(Program(1))
@@ -93,7 +93,9 @@ def dump_execute_outputs(stdout: str, stderr: str, **others: str) -> None:
 def execute(cmd: List[str],
             stdout: IO = sys.stdout,
             stderr: IO = sys.stderr,
-            timeout: Optional[int] = None) -> None:
+            timeout: Optional[int] = None,
+            cwd: Optional[str] = None,
+            env: Optional[Dict[str, str]] = None) -> None:
     # version specific handling
     version_specific_kwargs = {}  # type: Dict[str, Any]
     if sys.version_info >= (3, 6):
@@ -104,6 +106,8 @@ def execute(cmd: List[str],
             bufsize=0,
             stdout=stdout,
             stderr=stderr,
+            cwd=cwd,
+            env=env,
             universal_newlines=True,
             **version_specific_kwargs,
     ) as p:
@@ -123,7 +127,8 @@ def execute(cmd: List[str],
 
 def execute0(cmd: List[str],
              timeout: Optional[int] = None,
-             timeout_allowed: bool = False) -> Tuple[str, str]:
+             timeout_allowed: bool = False,
+             cwd: Optional[str] = None) -> Tuple[str, str]:
     # version specific handling
     version_specific_kwargs = {}  # type: Dict[str, Any]
     if sys.version_info >= (3, 6):
@@ -134,6 +139,7 @@ def execute0(cmd: List[str],
             bufsize=16 * (1 << 20),
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
+            cwd=cwd,
             universal_newlines=True,
             **version_specific_kwargs,
     ) as p:
@@ -253,6 +259,19 @@ def parallelize(
             raise RuntimeError('Interrupted')
 
 
+def parallelize_iter(
+        func: Callable[[T], R],
+        args: List[T],
+        ncpu: Optional[int] = None) -> Iterator[R]:
+    with Pool(ncpu) as pool:
+        try:
+            yield from pool.imap(func, args)
+        except KeyboardInterrupt:
+            pool.terminate()
+            pool.join()
+            raise RuntimeError('Interrupted')
+
+
 # input handling
 def ensure(*msg: str) -> bool:
     choice = input('{} [y/N]: '.format(' '.join(msg)))
@@ -141,6 +141,8 @@ class Bean(object):
         - declaring fields in the dataclass style
     """
 
+    __slots__ = ('__bean_type__', '__type_bean__', '__bean__')
+
     def __init__(self) -> None:
         bean_type = Bean.__collect__(type(self))
 
@@ -210,8 +212,8 @@ class Bean(object):
     def __getattribute__(self, attr: str) -> Any:
         item = object.__getattribute__(self, attr)
 
-        # allow pickle to work
-        if attr == '__dict__':
+        # allow pickle to work (__setstate__ is looked up on a blank object)
+        if attr == '__dict__' or attr == '__setstate__':
             return item
 
         # check if this is a bean attr
@@ -233,6 +235,28 @@ class Bean(object):
         assert isinstance(item, Attr)
         return item.get()
 
+    # pickling: slotted beans may carry no __dict__, collect the slots too,
+    # bypassing __getattribute__ so that the raw Attr wrappers are saved
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {}  # type: Dict[str, Any]
+        for cls in type(self).__mro__:
+            for k in getattr(cls, '__slots__', ()):
+                try:
+                    state[k] = object.__getattribute__(self, k)
+                except AttributeError:
+                    pass
+
+        try:
+            state.update(object.__getattribute__(self, '__dict__'))
+        except AttributeError:
+            pass
+
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for k, v in state.items():
+            object.__setattr__(self, k, v)
+
     def clone(self: B, ctxt: Optional[Dict['Bean', 'Bean']] = None) -> B:
         if ctxt is None:
             ctxt = {}
@@ -338,6 +362,17 @@ class Bean(object):
 
 
 class BeanRef(Generic[B]):
+    # NOTE: construct refs as BeanRef(...) rather than BeanRef[T](...),
+    # the subscripted call goes through typing and then fails (and swallows)
+    # tagging the slotted instance with __orig_class__, costing ~10x more
+    __slots__ = ('bean',)
 
     def __init__(self, bean: B) -> None:
         self.bean = bean
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'bean': self.bean}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # NOTE: older pickles carry the full __dict__ (incl. __orig_class__)
+        self.bean = state['bean']